@@ -39,6 +39,13 @@ from discord.commands.core import valid_locales
     is_flag=True,
     help="summon i18n file",
 )
+@click.option(
+    "-c",
+    "--compile-locales",
+    "compile_locales",
+    is_flag=True,
+    help="compile locales files for the deployment",
+)
 @click.option("-l", "lang", help="summon_i18n output langs", default="zh-TW", type=str)
 @click.option(
     "-f",
@@ -50,6 +57,25 @@ from discord.commands.core import valid_locales
 @click.option("-r", "recursive", help="use recursive", is_flag=True)
 @click.option("-o", "overwrite", help="overwrite old po file", is_flag=True)
 @click.option("--split", "shard", help="use shard", is_flag=True)
+@click.option(
+    "-w",
+    "--watch-locales",
+    "watch_locales",
+    help="reload changed locales files",
+    is_flag=True,
+)
+@click.option(
+    "--i18n-stats",
+    "i18n_stats",
+    help="count the translation lookups (owner command i18n_stats)",
+    is_flag=True,
+)
+@click.option(
+    "--log-background",
+    "log_background",
+    help="write the log file from a background thread",
+    is_flag=True,
+)
 def run(
     input_token: bool,
     dev: bool,
@@ -57,15 +83,19 @@ def run(
     level: List[str],
     env_path: Union[str, bool],
     summon_i18n: bool,
+    compile_locales: bool,
     lang: str,
     arg_include_paths: Path,
     recursive: bool,
     overwrite: bool,
     shard: bool,
+    watch_locales: bool,
+    i18n_stats: bool,
+    log_background: bool,
 ):
     from .core.logging import init_logging
 
-    init_logging(level=level)
+    init_logging(level=level, background=log_background)
 
     if summon_i18n:
         if lang == ".":
@@ -82,9 +112,17 @@ def run(
             arg_include_paths=arg_include_paths,
             recursive=recursive,
             overwrite=overwrite,
+            compile=True,
         )
         return
 
+    if compile_locales:
+        from .core.i18n import compile_locales as _compile_locales
+
+        for path in _compile_locales(*arg_include_paths or [Path(__file__).parent]):
+            click.echo(f"compile {path} done")
+        return
+
     if env_path is not None:
         if isinstance(env_path, str):
             dotenv.load_dotenv(env_path)
@@ -97,6 +135,14 @@ def run(
         # if BOT_SHARD is True use shard connect to discord
         os.environ["BOT_SHARD"] = "1"
 
+    if watch_locales:
+        # if LOCALES_WATCH is True reload changed `.po` files while running
+        os.environ["LOCALES_WATCH"] = "1"
+
+    if i18n_stats:
+        # if I18N_STATS is True count the lookups and misses of the translators
+        os.environ["I18N_STATS"] = "1"
+
     if input_token:
         token = click.prompt("Token", hide_input=True)
     elif not token:
@@ -11,10 +11,15 @@ from discord.ext import commands
 from bot import (
     ApplicationContext,
     Context,
+    LocalesWatcher,
     __version__,
     command_before_invoke,
+    enable_translator_stats,
     i18n_command,
+    parse_fallback_locales,
     set_default_locale,
+    set_fallback_locales,
+    wait_translations,
 )
 
 from .help import HelpView
@@ -46,8 +51,13 @@ class Bot(commands.Bot, metaclass=BotMeta):
         self._uptime: Optional[datetime] = None
         self.base_lang = kwargs.pop("lang", os.getenv("BASE_LANG", "zh-TW"))
         self.console = rich.get_console()
+        self.locales_watcher = LocalesWatcher() if os.getenv("LOCALES_WATCH") else None
 
         set_default_locale(self.base_lang)
+        if fallback_locales := os.getenv("LOCALES_FALLBACK"):
+            set_fallback_locales(parse_fallback_locales(fallback_locales))
+        if os.getenv("I18N_STATS"):
+            enable_translator_stats()
 
         intents = Intents.default()
         intents.message_content = True
@@ -67,6 +77,12 @@ class Bot(commands.Bot, metaclass=BotMeta):
         self.load_extension("bot.core.commands")
         self.load_extension("bot.cogs", recursive=True)
 
+    async def start(self, *args: Any, **kwargs: Any) -> None:
+        # the catalogs of the loaded cogs are loading in the background
+        await wait_translations()
+
+        await super().start(*args, **kwargs)
+
     @property
     def uptime(self) -> Optional[datetime]:
         return self._uptime
@@ -90,6 +106,16 @@ class Bot(commands.Bot, metaclass=BotMeta):
             return channel
         return await self.fetch_channel(channel_id)
 
+    async def get_context(self, message: discord.Message, *, cls=Context) -> Context:
+        return await super().get_context(message, cls=cls)
+
+    async def get_application_context(
+        self,
+        interaction: discord.Interaction,
+        cls=ApplicationContext,
+    ) -> ApplicationContext:
+        return await super().get_application_context(interaction, cls=cls)
+
     def add_cog(self, cog: discord.Cog, *, override: bool = False) -> None:
         # https://discord.com/developers/docs/reference#locales
         super().add_cog(cog, override=override)
@@ -0,0 +1,260 @@
+from __future__ import annotations
+
+import logging
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+
+__all__ = (
+    "MOCatalog",
+    "CompactCatalog",
+    "compile_catalog",
+    "compact_catalogs",
+)
+
+log = logging.getLogger(__name__)
+
+# https://www.gnu.org/software/gettext/manual/html_node/MO-Files.html
+MO_MAGIC = 0x950412DE
+_HEADER = struct.Struct("<7I")
+_ENTRY = struct.Struct("<2I")
+# the header entry (empty msgid), read by gettext for the charset
+MO_HEADER = b"Content-Type: text/plain; charset=UTF-8\n"
+# the decoded lookups kept by a catalog, the used keys are a small part of it
+_CACHE_SIZE = 4096
+
+
+class MOCatalog(Mapping[str, str]):
+    """
+    A read-only message catalog backed by a memory-mapped `.mo` file.
+
+    Nothing is parsed when the catalog is opened, the originals table
+    is sorted so a lookup is a binary search over the mapped bytes,
+    the results are cached. The header entry (empty msgid) is not a translation.
+    """
+
+    __slots__ = (
+        "path",
+        "revision",
+        "_buf",
+        "_first",
+        "_size",
+        "_originals",
+        "_translations",
+        "_cache",
+    )
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+
+        with open(self.path, "rb") as file:
+            self._buf = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        try:
+            magic, revision, size, originals, translations, _, _ = _HEADER.unpack_from(
+                self._buf
+            )
+        except struct.error:
+            magic = None
+
+        if magic != MO_MAGIC or not self._check(size, originals, translations):
+            self._buf.close()
+            raise ValueError(f"{self.path} is not a valid .mo file")
+
+        self.revision: int = revision
+        self._size: int = size
+        self._originals: int = originals
+        self._translations: int = translations
+        self._first = int(size > 0 and self._string(originals, 0) == b"")
+        self._cache: dict[str, str | None] = {}
+
+    def _check(self, size: int, *tables: int) -> bool:
+        # the tables and their last string (the strings are written in the table
+        # order) must be in the file, a truncated file would fail in a lookup
+        length = len(self._buf)
+        for table in tables:
+            if table + size * _ENTRY.size > length:
+                return False
+            if size:
+                string_length, offset = _ENTRY.unpack_from(
+                    self._buf, table + (size - 1) * _ENTRY.size
+                )
+                if offset + string_length > length:
+                    return False
+        return True
+
+    def _string(self, table: int, index: int) -> bytes:
+        length, offset = _ENTRY.unpack_from(self._buf, table + index * _ENTRY.size)
+        if (end := offset + length) > len(self._buf):
+            raise ValueError(f"{self.path} is truncated")
+        return self._buf[offset:end]
+
+    def _find(self, key: bytes) -> int:
+        lo, hi = self._first, self._size
+        while lo < hi:
+            mid = (lo + hi) // 2
+            current = self._string(self._originals, mid)
+            if current < key:
+                lo = mid + 1
+            elif current > key:
+                hi = mid
+            else:
+                return mid
+        return -1
+
+    def lookup(self, key: str) -> str | None:
+        """The translation of `key`, without the cache"""
+        try:
+            if not key or (index := self._find(key.encode("utf-8"))) < 0:
+                return None
+            return self._string(self._translations, index).decode("utf-8")
+        except ValueError as error:
+            log.warning(error)
+            return None
+
+    def __getitem__(self, key: str) -> str:
+        try:
+            value = self._cache[key]
+        except KeyError:
+            if len(self._cache) >= _CACHE_SIZE:
+                self._cache.clear()
+            value = self._cache[key] = self.lookup(key)
+
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def __contains__(self, key: object) -> bool:
+        return isinstance(key, str) and self.get(key) is not None
+
+    def __iter__(self) -> Iterator[str]:
+        for index in range(self._first, self._size):
+            yield self._string(self._originals, index).decode("utf-8")
+
+    def __len__(self) -> int:
+        return self._size - self._first
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} path={str(self.path)!r} size={len(self)}>"
+
+    def close(self) -> None:
+        self._buf.close()
+
+
+class CompactCatalog(Mapping[str, str]):
+    """
+    A read-only message catalog of one locale, the msgid index is shared
+    by every locale of the same locales directory, see `compact_catalogs`.
+    """
+
+    __slots__ = ("index", "values")
+
+    def __init__(self, index: dict[str, int], values: tuple[str | None, ...]) -> None:
+        self.index = index
+        self.values = values
+
+    def __getitem__(self, key: str) -> str:
+        if (value := self.values[self.index[key]]) is None:
+            raise KeyError(key)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        values = self.values
+        return (key for key, slot in self.index.items() if values[slot] is not None)
+
+    def __len__(self) -> int:
+        return len(self.values) - self.values.count(None)
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__} size={len(self)}>"
+
+
+def compact_catalogs(
+    catalogs: Mapping[str, Mapping[str, str]],
+) -> dict[str, CompactCatalog]:
+    """
+    Store parsed catalogs as one interned msgid index and a tuple of
+    translations per locale, so the msgids are kept once and not per locale.
+
+    Parameters:
+    -----------
+    catalogs: `Mapping[str, Mapping[str, str]]`
+        `{locale: {msgid: msgstr}}`
+    """
+    index: dict[str, int] = {}
+    for catalog in catalogs.values():
+        for key in catalog:
+            if key not in index:
+                index[sys.intern(key)] = len(index)
+
+    result = {}
+    for locale, catalog in catalogs.items():
+        values: list[str | None] = [None] * len(index)
+        for key, value in catalog.items():
+            values[index[key]] = value
+        result[locale] = CompactCatalog(index, tuple(values))
+    return result
+
+
+def compile_catalog(
+    translations: Mapping[str, str], path: str | Path, revision: int = 0
+) -> Path:
+    """
+    Write `translations` to a `.mo` file that can be opened by `MOCatalog`
+    (or `gettext.GNUTranslations`, the header entry sets the UTF-8 charset).
+    The file is replaced atomically, so opened catalogs stay valid.
+
+    Parameters:
+    -----------
+    translations: `Mapping[str, str]`
+        The parsed catalog, `{msgid: msgstr}`.
+    path: `str` | `Path`
+        The output path.
+    revision: `int`
+        The minor revision of the file format, ignored by the `.mo` readers.
+        It can tell the compiler version, see `MOCatalog.revision`.
+    """
+    path = Path(path)
+    entries = sorted(
+        [(b"", MO_HEADER)]
+        + [
+            (key.encode("utf-8"), value.encode("utf-8"))
+            for key, value in translations.items()
+            if key
+        ]
+    )
+
+    size = len(entries)
+    originals = _HEADER.size
+    table_translations = originals + size * _ENTRY.size
+    offset = table_translations + size * _ENTRY.size
+
+    tables, data = bytearray(), bytearray()
+    for column in (0, 1):
+        for entry in entries:
+            string = entry[column]
+            tables += _ENTRY.pack(len(string), offset + len(data))
+            data += string + b"\0"
+
+    # unique, the same catalog may be compiled by several threads at once
+    fd, tmp_path = tempfile.mkstemp(prefix=f".{path.name}.", dir=path.parent)
+    try:
+        os.chmod(tmp_path, 0o644)  # `mkstemp` only allows the owner
+        with os.fdopen(fd, "wb") as file:
+            file.write(
+                _HEADER.pack(
+                    MO_MAGIC, revision, size, originals, table_translations, 0, offset
+                )
+            )
+            file.write(tables)
+            file.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return path
@@ -1,4 +1,6 @@
 import inspect
+import io
+import json
 from typing import Dict
 
 import discord
@@ -17,8 +19,9 @@ from bot import (
     BaseCog,
     Bot,
     Translator,
+    async_reload_locales,
     get_absolute_name_from_path,
-    reload_locales,
+    get_translator_stats,
 )
 
 _ = Translator(__name__)
@@ -104,12 +107,54 @@ class BaseCommandsCog(BaseCog, name="核心"):
     @commands.command()
     @commands.is_owner()
     async def reload(self, ctx: ApplicationContext):
-        reload_locales()
+        await async_reload_locales()
         await ctx.send(
             "請選取您要的模式",
             view=CogConnectionView(self.bot),
         )
 
+    @commands.command()
+    @commands.is_owner()
+    async def i18n_stats(self, ctx: ApplicationContext, top: int = 10):
+        if not (stats := get_translator_stats()):
+            await ctx.send("未啟用翻譯統計，請使用 `--i18n-stats` 啟動")
+            return
+
+        embed = discord.Embed(title="翻譯統計")
+        for path, data in stats.items():
+            hot_keys = "\n".join(
+                f"{count} `{key[:50]}`"
+                for key, count in list(data["hot_keys"].items())[:top]
+            )
+            missed_keys = "\n".join(
+                f"{miss['count']} {miss['lang']} `{miss['key'][:50]}`"
+                for miss in data["missed_keys"][:top]
+            )
+            embed.add_field(
+                name=path[-256:],
+                value=(
+                    f"查詢 {data['lookups']} 次，缺少翻譯 {data['misses']} 次，"
+                    f"耗時 {data['time_ms']:.2f} ms\n"
+                    f"{hot_keys}\n{missed_keys}"
+                )[:1024],
+                inline=False,
+            )
+            # the embed limits, 25 fields and 6000 characters (the footer is kept)
+            if len(embed.fields) > 25 or len(embed) > 6000 - 50:
+                embed.remove_field(-1)
+                embed.set_footer(
+                    text=f"僅顯示 {len(embed.fields)}/{len(stats)} 個，完整統計請見附件"
+                )
+                break
+
+        await ctx.send(
+            embed=embed,
+            file=discord.File(
+                io.BytesIO(json.dumps(stats, ensure_ascii=False, indent=2).encode()),
+                filename="i18n_stats.json",
+            ),
+        )
+
     @discord.slash_command(guild_only=True)
     @discord.option(
         "command",
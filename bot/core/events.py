@@ -24,6 +24,9 @@ class BaseEventsCog(BaseCog):
 
         bot._uptime = datetime.now()
 
+        if bot.locales_watcher is not None:
+            bot.locales_watcher.start()
+
         table_cogs_info = Table(show_edge=False, show_header=False, box=MINIMAL)
 
         table_cogs_info.add_column(style="blue")
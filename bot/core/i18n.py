@@ -1,61 +1,157 @@
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import io
 import logging
-import traceback
-from collections import UserDict
+import os
+import re
+import sys
+import time
+from collections import ChainMap, Counter
+from concurrent.futures import Future, ThreadPoolExecutor
 from contextvars import ContextVar
-from enum import Enum, auto
+from enum import IntEnum, auto
 from pathlib import Path
-from typing import TYPE_CHECKING, ClassVar, TypeVar, overload
+from string import Formatter
+from typing import (
+    TYPE_CHECKING,
+    Callable,
+    Iterable,
+    Iterator,
+    Mapping,
+    TypeVar,
+    overload,
+)
 
 from discord import ApplicationContext as DiscordApplicationContext
-from discord import Cog, ContextMenuCommand, Member, SlashCommand, User
+from discord import (
+    ApplicationCommand,
+    Cog,
+    ContextMenuCommand,
+    Member,
+    SlashCommand,
+    User,
+)
 from discord.commands.core import docs, valid_locales
+from discord.ext.commands import Command
 from discord.ext.commands import Context as DiscordContext
 
+from .catalog import MOCatalog, compact_catalogs, compile_catalog
+
+try:
+    from watchfiles import awatch
+except ImportError:
+    awatch = None
+
 if TYPE_CHECKING:
     from ..utils import ApplicationContext, Context, I18nCog
 
 log = logging.getLogger(__name__)
 
+_executor = ThreadPoolExecutor(thread_name_prefix="i18n")
 _translators: dict[Path, "Translator"] = {}
+_module_translators: dict[str, "Translator"] = {}  # {module name: translator}
+_valid_locales = frozenset(valid_locales)
+_stats_enabled = False  # see `enable_translator_stats`
+# {locale: fallback locales}, see `set_fallback_locales`
+_fallback_locales: dict[str, tuple[str, ...]] = {
+    "zh-CN": ("zh-TW",),
+    "en-GB": ("en-US",),
+    "es-419": ("es-ES",),
+}
 _file_default_lang = "zh-TW"
+# the `.mo` revision of the compiled `.po` files, increase it when the parser
+# output changes, the catalogs compiled by an older version are compiled again
+_CATALOG_REVISION = 2
+_FORMAT_FIELD_RE = re.compile(r"[^.\[]*")
 _default_lang = ContextVar("_default_lang", default=_file_default_lang)
 
 _CogT = TypeVar("_CogT", bound="Cog | I18nCog")
 _CommandT = TypeVar("_CommandT", bound=SlashCommand | ContextMenuCommand)
 
 
-class _po_parse_step(Enum):
-    NULL = auto
-    MSGID = auto
-    MSGSTR = auto
+class _po_parse_step(IntEnum):
+    NULL = auto()
+    MSGCTXT = auto()
+    MSGID = auto()
+    MSGID_PLURAL = auto()
+    MSGSTR = auto()
+
+
+_PO_KEYWORDS = {
+    "msgctxt": _po_parse_step.MSGCTXT,
+    "msgid": _po_parse_step.MSGID,
+    "msgid_plural": _po_parse_step.MSGID_PLURAL,
+}
+_PO_STRING_RE = re.compile(r'"((?:[^"\\]|\\.)*)"')
+_PO_ESCAPES = {
+    "\\": "\\",
+    '"': '"',
+    "n": "\n",
+    "t": "\t",
+    "r": "\r",
+    "a": "\a",
+    "b": "\b",
+    "f": "\f",
+    "v": "\v",
+}
+_PO_ESCAPE_RE = re.compile(r"\\([\\\"ntrabfv])")
 
 
 class Translator:
-    locales_path: ClassVar[Path]
-
-    def __new__(cls, *_, **kwargs):
-        locales_path = kwargs.pop("locales_path", None)
-
-        if locales_path in _translators:
-            return _translators.get(locales_path)
-
-        self = super().__new__(cls)
-        self.locales_path = Path(
-            locales_path
-            if locales_path
-            else Path(traceback.extract_stack()[-2].filename).parent / "locales"
-        )
-        _translators[self.locales_path] = self
+    locales_path: Path
+    translations: dict[str, Mapping[str, str]]  # dict[lang, dict[key, str]]
+    catalogs: dict[str, Mapping[str, str]]  # `translations` without the fallbacks
+    _templates: dict[tuple[str, str], Callable[..., str]]  # {(key, lang): format}
+    _localizations: dict[str, dict[str, str]]  # {key: {lang: str}}
+    stats: TranslatorStats | None
+
+    def __new__(cls, name: str, locales_path: str | Path | None = None):
+        # bind the translator to the module name once, see `_module_translators`
+        bind_module = locales_path is None and name in sys.modules
+        if locales_path is None:
+            if (self := _module_translators.get(name)) is not None:
+                return self
+            locales_path = _get_module_locales_path(name)
+
+        locales_path = Path(locales_path).resolve()
+
+        # one instance per locales directory, see `_translators`
+        if (self := _translators.get(locales_path)) is None:
+            self = super().__new__(cls)
+            self.locales_path = locales_path
+            _translators[locales_path] = self
+
+        if bind_module:
+            _module_translators[name] = self
         return self
 
     # locales_path is type hint, accomplish in __new__
     def __init__(self, name: str, locales_path: str | None = None) -> None:
+        # python calls `__init__` on the cached instance as well,
+        # catalogs are only (re)loaded by `reload_locales`
+        if hasattr(self, "name"):
+            return
+
         self.name = name
+        self._templates = {}
+        self._localizations = {}
+        self.stats = TranslatorStats() if _stats_enabled else None
+        # loaded in the background, see `__getattr__` and `wait_translations`
+        self._pending = _submit_langs_translation(self.locales_path)
+
+    def __getattr__(self, name: str):
+        if (
+            name not in ("translations", "catalogs")
+            or (pending := self.__dict__.get("_pending")) is None
+        ):
+            raise AttributeError(
+                f"{self.__class__.__name__!r} object has no attribute {name!r}"
+            )
 
-        self.translations: dict[str, dict[str, str]] = {}  # dict[lang, dict[key, str]]
-        self.load_translations()
+        self.set_translations(_wait_langs_translation(pending))
+        return getattr(self, name)
 
     # fmt: off
     @overload
@@ -72,42 +168,191 @@ class Translator:
         all: bool | None = None,
         **kwargs,
     ) -> "TranslatorString" | dict[str, str]:
-        local = local or get_default_locale()
-
-        translations = {_file_default_lang: untranslated}
-        for lang, translated in self.translations.items():
-            translations[lang] = translated.get(untranslated) or untranslated
+        string = TranslatorString(untranslated, self, local or get_default_locale())
 
         if all:
-            return translations
+            return dict(self.get_localizations(untranslated))
+        return string
+
+    def get_translation(self, untranslated: str, local: str) -> str:
+        if self.stats is not None:
+            return self.stats.get_translation(self, untranslated, local)
 
         try:
-            untranslated = self.translations[local][untranslated]
+            return self.translations[local][untranslated]
         except KeyError:
-            pass
+            return untranslated
 
-        return TranslatorString(untranslated, translations)
+    def get_template(self, untranslated: str, local: str) -> Callable[..., str]:
+        """
+        Get the cached `str.format` of the translated template,
+        templates are validated when the catalog is loaded, see `_parse`.
+        """
+        try:
+            template = self._templates[untranslated, local]
+        except KeyError:
+            template = self.get_translation(untranslated, local).format
+            self._templates[untranslated, local] = template
+        else:
+            if self.stats is not None:
+                self.stats.lookups[untranslated] += 1
+        return template
+
+    def get_localizations(self, untranslated: str) -> dict[str, str]:
+        """
+        Get the translation of every valid locale (e.g. `name_localizations`),
+        the map is built once per key and shared, copy it before modifying.
+        """
+        try:
+            return self._localizations[untranslated]
+        except KeyError:
+            localizations = dict.fromkeys(valid_locales, untranslated)
+            for lang, catalog in self.translations.items():
+                if (translated := catalog.get(untranslated)) is not None:
+                    localizations[lang] = translated
+            self._localizations[untranslated] = localizations
+            return localizations
 
     def load_translations(self) -> None:
-        self.translations = _get_langs_translation(self.locales_path)
+        self.set_translations(_get_langs_translation(self.locales_path))
+
+    def set_translations(self, catalogs: dict[str, Mapping[str, str]]) -> None:
+        self.catalogs = catalogs
+        self.translations = _resolve_fallbacks(catalogs)
+        self._templates = {}
+        self._localizations = {}
+        self.__dict__.pop("_pending", None)
+
+    def load_translation(self, path: Path) -> None:
+        """
+        Reload the catalog of one `<lang>.po` file, the other locales
+        are kept and the new tables are swapped in at once.
+        """
+        if (lang := path.stem) not in _valid_locales:
+            return
+
+        catalog = _load_catalog(path) if path.is_file() else {}
+        if isinstance(catalog, dict):
+            catalog = compact_catalogs({lang: catalog})[lang]
+        self.catalogs = self.catalogs | {lang: catalog}
+
+        # only `lang` and the locales falling back on it are layered again
+        changed = {lang} | {
+            locale for locale, chain in _fallback_locales.items() if lang in chain
+        }
+        translations = dict(self.translations)
+        for locale in changed:
+            if (table := _resolve_fallback(self.catalogs, locale)) is None:
+                translations.pop(locale, None)
+            else:
+                translations[locale] = table
+        self.translations = translations
+        self._templates = {
+            key: template
+            for key, template in self._templates.items()
+            if key[1] not in changed
+        }
+        self._localizations = {}
+
+
+class TranslatorStats:
+    """
+    Lookup counters of a translator, see `enable_translator_stats`.
 
+    A cached template (`TranslatorString.format`) counts as a lookup,
+    its miss is only counted once, when the template is built.
+    """
+
+    __slots__ = ("lookups", "misses", "time_ns")
+
+    def __init__(self) -> None:
+        self.lookups: Counter[str] = Counter()  # {key: count}
+        self.misses: Counter[tuple[str, str]] = Counter()  # {(lang, key): count}
+        self.time_ns = 0
+
+    def get_translation(
+        self, translator: Translator, untranslated: str, local: str
+    ) -> str:
+        start = time.perf_counter_ns()
+        self.lookups[untranslated] += 1
+        try:
+            return translator.translations[local][untranslated]
+        except KeyError:
+            self.misses[local, untranslated] += 1
+            return untranslated
+        finally:
+            self.time_ns += time.perf_counter_ns() - start
+
+    def to_dict(self, top: int | None = None) -> dict[str, object]:
+        return {
+            "lookups": sum(self.lookups.values()),
+            "misses": sum(self.misses.values()),
+            "time_ms": self.time_ns / 1e6,
+            "hot_keys": dict(self.lookups.most_common(top)),
+            "missed_keys": [
+                {"lang": lang, "key": key, "count": count}
+                for (lang, key), count in self.misses.most_common(top)
+            ],
+        }
+
+
+class TranslatorString(Mapping[str, str]):
+    """
+    A translated string, resolved lazily from the translator catalogs.
+
+    `str()` gives the translation in `local`, the mapping interface
+    (`dict(string)`, `string.get(lang)`) gives the translation
+    of every valid locale.
+    """
+
+    __slots__ = ("untranslated", "translator", "local")
 
-class TranslatorString(UserDict):
-    def __init__(self, str_data: str, dict_data: dict[str, str]) -> None:
-        self.str_data = str_data
-        self.data = dict_data
+    def __init__(
+        self,
+        untranslated: str,
+        translator: Translator | None = None,
+        local: str | None = None,
+    ) -> None:
+        self.untranslated = untranslated
+        self.translator = translator
+        self.local = local
 
     def __repr__(self) -> str:
-        return self.str_data
+        return str(self)
 
     def __str__(self) -> str:
-        return self.str_data
+        if self.translator is None:
+            return self.untranslated
+        return self.translator.get_translation(
+            self.untranslated, self.local or get_default_locale()
+        )
+
+    def __getitem__(self, local: str) -> str:
+        if local not in _valid_locales:
+            raise KeyError(local)
+        if self.translator is None:
+            return self.untranslated
+        return self.translator.get_translation(self.untranslated, local)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(valid_locales)
+
+    def __len__(self) -> int:
+        return len(valid_locales)
+
+    def localizations(self) -> dict[str, str]:
+        """
+        `dict(self)` without a lookup per locale, see `Translator.get_localizations`.
+        """
+        if self.translator is None:
+            return dict.fromkeys(valid_locales, self.untranslated)
+        return self.translator.get_localizations(self.untranslated)
 
     @classmethod
     def from_str(cls, str_data: str | TranslatorString) -> TranslatorString:
         if isinstance(str_data, TranslatorString):
             return str_data
-        return cls(str_data, {k: str_data for k in valid_locales})
+        return cls(str_data)
 
     # fmt: off
     @overload
@@ -117,7 +362,19 @@ class TranslatorString(UserDict):
     # fmt: on
 
     def format(self, *args, **kwargs):
-        return str(self).format(*args, **kwargs)
+        if self.translator is None:
+            return self.untranslated.format(*args, **kwargs)
+        return self.translator.get_template(
+            self.untranslated, self.local or get_default_locale()
+        )(*args, **kwargs)
+
+
+def _get_module_locales_path(name: str) -> Path:
+    if module_file := getattr(sys.modules.get(name), "__file__", None):
+        return Path(module_file).parent / "locales"
+
+    # not an imported module name, use the file of `Translator(...)` caller
+    return Path(sys._getframe(2).f_code.co_filename).parent / "locales"
 
 
 def get_default_locale() -> str:
@@ -134,62 +391,512 @@ def set_default_locale(locale: str) -> None:
     _default_lang.set(locale)
 
 
-def reload_locales() -> None:
-    log.info("Reloading locales")
+def set_fallback_locales(chains: Mapping[str, Iterable[str]]) -> None:
+    """
+    Set the locales to try before the untranslated text, e.g.
+    `{"zh-CN": ["zh-TW"], "pt-BR": ["pt-PT", "es-ES"]}`, the chains are not
+    followed recursively. The loaded catalogs are layered again.
+    """
+    global _fallback_locales
+
+    fallback_locales = {}
+    for locale, chain in chains.items():
+        fallback_locales[locale] = chain = tuple(chain)
+        for lang in (locale, *chain):
+            if lang not in _valid_locales:
+                raise ValueError(
+                    f"Locale {lang!r} is not a valid locale, see {docs}/reference"
+                    "#locales for list of supported locales."
+                )
+
+    _fallback_locales = fallback_locales
     for translator in _translators.values():
-        translator.load_translations()
+        if "catalogs" in translator.__dict__:
+            translator.set_translations(translator.catalogs)
 
 
-def _get_langs_translation(path: Path) -> dict[str, dict[str, str]]:
-    if not path.is_dir():
-        return {}
+def parse_fallback_locales(text: str) -> dict[str, list[str]]:
+    """
+    Parse the fallback chains of `LOCALES_FALLBACK`, e.g.
+    `"zh-CN:zh-TW,en-GB:en-US"` -> `{"zh-CN": ["zh-TW"], "en-GB": ["en-US"]}`
+    """
+    chains = {}
+    for chain in filter(None, text.replace(" ", "").split(",")):
+        locale, *fallback = chain.split(":")
+        chains[locale] = fallback
+    return chains
+
+
+def enable_translator_stats(enabled: bool = True) -> None:
+    """
+    Count the lookups, misses and lookup time of every translator,
+    the counters are kept when it's already enabled, see `get_translator_stats`.
+    """
+    global _stats_enabled
+
+    _stats_enabled = enabled
+    for translator in _translators.values():
+        if not enabled:
+            translator.stats = None
+        elif translator.stats is None:
+            translator.stats = TranslatorStats()
 
-    translations = dict.fromkeys(valid_locales, dict[str, str]())
 
+def get_translator_stats(top: int | None = None) -> dict[str, dict[str, object]]:
+    """
+    Get the counters of every translator by locales directory,
+    `top` limits the keys to the most common ones.
+    """
+    return {
+        str(path): translator.stats.to_dict(top)
+        for path, translator in _translators.items()
+        if translator.stats is not None
+    }
+
+
+def _get_translators(locales_paths: tuple[str | Path, ...]) -> list[Translator]:
+    if not locales_paths:
+        return list(_translators.values())
+
+    return [
+        translator
+        for path in locales_paths
+        if (translator := _translators.get(Path(path).resolve()))
+    ]
+
+
+def reload_locales(*locales_paths: str | Path) -> None:
+    """
+    Reload the catalogs of the registered translators.
+
+    Parameters:
+    -----------
+    *locales_paths: list[`str` | `Path`]
+        Only reload the translators of these locales directories,
+        reload all translators if empty.
+    """
+    translators = _get_translators(locales_paths)
+
+    log.info(f"Reloading locales ({len(translators)} translators)")
+    pending = [_submit_langs_translation(tr.locales_path) for tr in translators]
+    for translator, futures in zip(translators, pending):
+        translator.set_translations(_wait_langs_translation(futures))
+
+
+async def async_reload_locales(*locales_paths: str | Path) -> None:
+    """
+    The same as `reload_locales`, but the event loop is not blocked
+    while the catalogs are loading.
+    """
+    translators = _get_translators(locales_paths)
+
+    log.info(f"Reloading locales ({len(translators)} translators)")
+    pending = [_submit_langs_translation(tr.locales_path) for tr in translators]
+    await asyncio.gather(
+        *(asyncio.wrap_future(future) for futures in pending for future in futures)
+    )
+
+    # every catalog is loaded, swap them in at once
+    for translator, futures in zip(translators, pending):
+        translator.set_translations(_wait_langs_translation(futures))
+
+
+async def wait_translations() -> None:
+    """
+    Wait for the catalogs of the new translators loading in the background.
+    """
+    pending = [
+        (translator, futures)
+        for translator in list(_translators.values())
+        if (futures := translator.__dict__.get("_pending")) is not None
+    ]
+    await asyncio.gather(
+        *(asyncio.wrap_future(future) for _, futures in pending for future in futures)
+    )
+
+    for translator, futures in pending:
+        translator.set_translations(_wait_langs_translation(futures))
+
+
+class LocalesWatcher:
+    """
+    Watch the `locales/*.po` files of the registered translators and reload
+    only the changed files.
+
+    Uses `watchfiles` (inotify) when it is installed, otherwise polls
+    the files every `interval` seconds.
+    """
+
+    def __init__(self, interval: float = 2.0) -> None:
+        self.interval = interval
+        self._mtimes: dict[Path, int] = {}
+        self._task: asyncio.Task | None = None
+
+    @staticmethod
+    def _scan() -> dict[Path, int]:
+        mtimes = {}
+        for translator in list(_translators.values()):
+            for path in translator.locales_path.glob("*.po"):
+                try:
+                    mtimes[path] = path.stat().st_mtime_ns
+                except FileNotFoundError:
+                    pass
+        return mtimes
+
+    def check(self) -> list[Path]:
+        """
+        Reload the changed, added or removed `.po` files since the last check.
+        """
+        old_mtimes, self._mtimes = self._mtimes, self._scan()
+        changed = [
+            path
+            for path in old_mtimes.keys() | self._mtimes.keys()
+            if old_mtimes.get(path) != self._mtimes.get(path)
+        ]
+
+        for path in changed:
+            if translator := _translators.get(path.parent):
+                log.info(f"Reloading locale file: {path}")
+                try:
+                    translator.load_translation(path)
+                except Exception as error:
+                    log.exception(type(error).__name__, exc_info=error)
+        return changed
+
+    def start(self) -> asyncio.Task:
+        if self._task is None or self._task.done():
+            self._mtimes = self._scan()
+            self._task = asyncio.create_task(self._run())
+        return self._task
+
+    def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+
+    @staticmethod
+    def _get_directories() -> set[Path]:
+        return {
+            translator.locales_path
+            for translator in list(_translators.values())
+            if translator.locales_path.is_dir()
+        }
+
+    async def _run(self) -> None:
+        while awatch is None or not (directories := self._get_directories()):
+            await asyncio.sleep(self.interval)
+            await asyncio.to_thread(self.check)
+
+        while True:
+            async for changes in awatch(
+                *directories,
+                watch_filter=lambda _, path: path.endswith(".po"),
+                rust_timeout=int(self.interval * 1000),
+                yield_on_timeout=True,
+            ):
+                if changes:
+                    await asyncio.to_thread(self.check)
+                # restart the watcher when new locales directories are loaded
+                if (new_directories := self._get_directories()) != directories:
+                    directories = new_directories
+                    await asyncio.to_thread(self.check)
+                    break
+
+
+def _get_langs_translation(path: Path) -> dict[str, Mapping[str, str]]:
+    return _wait_langs_translation(_submit_langs_translation(path))
+
+
+def _submit_langs_translation(path: Path) -> list[Future[tuple[str, Mapping] | None]]:
+    """
+    Load the catalog of every language in `_executor`, one task per file.
+    """
+    if not path.is_dir():
+        return []
+
+    futures = []
     for path in path.iterdir():
         file_lang = path.stem
         if path.is_file() and path.suffix == ".po" and file_lang in valid_locales:
-            translations[file_lang] = _parse(path.read_text(encoding="utf-8"))
+            futures.append(_executor.submit(_load_lang_catalog, file_lang, path))
+        elif path.suffix == ".mo" and file_lang in valid_locales:
+            # compiled from the `.po` file, see `_load_catalog`, or shipped alone
+            if not path.with_suffix(".po").is_file():
+                futures.append(_executor.submit(_load_lang_catalog, file_lang, path))
         elif file_lang != "base":
             log.warn(f"Unexpected filename, 'invalid' file: {path}")
+    return futures
+
+
+def _wait_langs_translation(
+    futures: list[Future[tuple[str, Mapping] | None]],
+) -> dict[str, Mapping[str, str]]:
+    translations = dict(result for future in futures if (result := future.result()))
+
+    # the mapped `.mo` catalogs are not python objects, only compact the parsed ones
+    parsed = {lang: tr for lang, tr in translations.items() if isinstance(tr, dict)}
+    translations.update(compact_catalogs(parsed))
     return translations
 
 
-def _parse(file_content: str) -> dict[str, str]:
-    translations = {}
-    step, untranslated, translated = _po_parse_step.NULL, "", ""
-
-    for line in file_content.splitlines():
-        line = line.strip()
-
-        if line.startswith('msgid "'):
-            if step == _po_parse_step.MSGSTR and translated:
-                translations[_unescape(untranslated)] = _unescape(translated)
-            step = _po_parse_step.MSGID
-            untranslated = line[7:-1]
-        elif line.startswith('"') and line.endswith('"'):
-            if step == _po_parse_step.MSGID:
-                untranslated += line[1:-1]
-            elif step == _po_parse_step.MSGSTR:
-                translated += line[1:-1]
-        elif line.startswith('msgstr "'):
-            step = _po_parse_step.MSGSTR
-            translated = line[8:-1]
+def _resolve_fallbacks(
+    catalogs: dict[str, Mapping[str, str]],
+) -> dict[str, Mapping[str, str]]:
+    """
+    The lookup table of every locale, see `_resolve_fallback`.
+    """
+    return {
+        locale: table
+        for locale in catalogs.keys() | _fallback_locales.keys()
+        if (table := _resolve_fallback(catalogs, locale)) is not None
+    }
 
-        if step is _po_parse_step.MSGSTR and translated:
-            translations[_unescape(untranslated)] = _unescape(translated)
 
-    return translations
+def _resolve_fallback(
+    catalogs: dict[str, Mapping[str, str]], locale: str
+) -> Mapping[str, str] | None:
+    """
+    The catalogs of the fallback chain of `locale` layered in a `ChainMap`,
+    nothing is copied, the mapped `.mo` catalogs stay shared between processes.
+    """
+    tables = [
+        catalogs[lang]
+        for lang in (locale, *_fallback_locales.get(locale, ()))
+        if lang in catalogs
+    ]
+    if len(tables) > 1:
+        return ChainMap(*tables)
+    return tables[0] if tables else None  # nothing to layer, share it
+
+
+def _load_lang_catalog(lang: str, path: Path) -> tuple[str, Mapping[str, str]] | None:
+    if path.suffix != ".mo":
+        return lang, _load_catalog(path)
+
+    catalog = MOCatalog(path)
+    if catalog.revision:
+        # compiled by `_load_catalog`, the `.po` file has been removed
+        catalog.close()
+        log.info(f"Removing the compiled catalog of a removed .po file: {path}")
+        path.unlink(missing_ok=True)
+        return None
+    return lang, catalog
+
+
+def compile_locales(*paths: str | Path) -> list[Path]:
+    """
+    Compile every `locales/*.po` file under `paths` (or in `paths`, when they
+    are `locales` directories) ahead of time, e.g. when deploying.
+    The bot processes only map the compiled catalogs, the mapped
+    pages are shared between all processes by the OS page cache.
+    """
+    compiled = []
+    for path in map(Path, paths):
+        pattern = "*.po" if path.name == "locales" else "**/locales/*.po"
+        for po_path in sorted(path.glob(pattern)):
+            if po_path.stem in _valid_locales:
+                _load_catalog(po_path)
+                compiled.append(_get_compiled_path(po_path))
+    return compiled
 
 
-def _unescape(string):
-    return (
-        string.replace(r"\\", "\\")
-        .replace(r"\t", "\t")
-        .replace(r"\r", "\r")
-        .replace(r"\n", "\n")
-        .replace(r"\"", '"')
-    )
+def _get_compiled_path(path: Path) -> Path:
+    """
+    The `.mo` path of the `.po` file, next to it or in `LOCALES_CACHE_DIR`
+    (e.g. for a read-only bot directory).
+    """
+    if cache_dir := os.getenv("LOCALES_CACHE_DIR"):
+        key = hashlib.blake2s(str(path.resolve().parent).encode(), digest_size=8)
+        return Path(cache_dir) / key.hexdigest() / f"{path.stem}.mo"
+    return path.with_suffix(".mo")
+
+
+def _load_catalog(path: Path) -> Mapping[str, str]:
+    """
+    Load the compiled `.mo` of the `.po` file, (re)compile it when it is
+    missing, older than the `.po` file or compiled by another parser version.
+    """
+    mo_path = _get_compiled_path(path)
+
+    try:
+        if mo_path.stat().st_mtime_ns >= path.stat().st_mtime_ns:
+            if (catalog := MOCatalog(mo_path)).revision == _CATALOG_REVISION:
+                return catalog
+            catalog.close()
+    except FileNotFoundError:
+        pass
+    except ValueError as error:
+        log.warning(f"Recompiling broken catalog: {error}")
+
+    with path.open(encoding="utf-8") as file:
+        translations = _parse(file, path)
+    try:
+        mo_path.parent.mkdir(parents=True, exist_ok=True)
+        return MOCatalog(compile_catalog(translations, mo_path, _CATALOG_REVISION))
+    except OSError as error:  # e.g. read-only file system
+        log.debug(f"Can't compile {path}: {error}")
+        return translations
+
+
+def _parse(file: str | Iterable[str], path: Path | None = None) -> dict[str, str]:
+    """
+    Parse the `.po` file content or an iterable of its lines (e.g. an opened file),
+    malformed entries are logged with their line number and skipped.
+
+    `msgctxt` entries are stored as `"{msgctxt}\\x04{msgid}"` (as in `.mo` files),
+    plural entries as their `msgstr[0]` and fuzzy entries are ignored.
+    """
+    parser = _POParser(path)
+    for lineno, line in enumerate(
+        io.StringIO(file) if isinstance(file, str) else file, 1
+    ):
+        parser.feed(lineno, line)
+    return parser.close()
+
+
+class _POParser:
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path or "<string>"
+        self.translations: dict[str, str] = {}
+        self.format_ids: set[str] = set()
+        self.flags: set[str] = set()
+        self._reset()
+
+    def _reset(self) -> None:
+        self.step = _po_parse_step.NULL
+        self.fields: dict[str, list[str]] = {}  # {keyword: strings}
+        self.field: list[str] = []
+        self.entry_flags: set[str] = set()
+        self.entry_lineno = 0
+        self.broken = False
+
+    def error(self, lineno: int, msg: str) -> None:
+        log.warning(f"{self.path}:{lineno}: {msg}")
+        self.broken = True
+
+    def feed(self, lineno: int, line: str) -> None:
+        if not (line := line.strip()):
+            return
+
+        if line[0] == "#":
+            if self.step is _po_parse_step.MSGSTR:
+                self._flush()
+            if line.startswith("#,"):
+                self.flags.update(flag.strip() for flag in line[2:].split(","))
+            return
+
+        if line[0] == '"':
+            if self.step is _po_parse_step.NULL:
+                self.error(lineno, "string without keyword")
+            elif (string := self._string(lineno, line)) is not None:
+                self.field.append(string)
+            return
+
+        keyword, _, string = line.partition(" ")
+        if keyword.startswith("msgstr"):
+            step = _po_parse_step.MSGSTR
+        elif (step := _PO_KEYWORDS.get(keyword)) is None:
+            self.error(lineno, f"unknown keyword {keyword!r}")
+            return
+
+        # `msgctxt` or `msgid` after `msgstr` (or a repeated one) starts the next entry
+        if (
+            self.step is _po_parse_step.NULL
+            or step < self.step
+            or (step is not _po_parse_step.MSGSTR and keyword in self.fields)
+        ):
+            if self.step is _po_parse_step.NULL:
+                self._reset()
+            else:
+                self._flush()
+            self.entry_flags, self.flags = self.flags, set()
+            self.entry_lineno = lineno
+
+        if keyword in self.fields:
+            self.error(lineno, f"duplicate {keyword!r}")
+        elif step is _po_parse_step.MSGSTR and "msgid" not in self.fields:
+            self.error(lineno, f"{keyword!r} without 'msgid'")
+
+        self.step = step
+        self.field = self.fields[keyword] = []
+        if (string := self._string(lineno, string.strip())) is not None:
+            self.field.append(string)
+
+    def _string(self, lineno: int, string: str) -> str | None:
+        # fast path, nothing to unescape
+        if (
+            len(string) > 1
+            and string[0] == string[-1] == '"'
+            and '"' not in (inner := string[1:-1])
+            and "\\" not in inner
+        ):
+            return inner
+
+        if (match := _PO_STRING_RE.fullmatch(string)) is None:
+            self.error(lineno, f"invalid string {string}")
+            return None
+        return _unescape(match.group(1))
+
+    def _flush(self) -> None:
+        fields = self.fields
+
+        if self.broken:
+            log.warning(f"{self.path}:{self.entry_lineno}: skip malformed entry")
+        elif "msgstr" not in fields and "msgstr[0]" not in fields:
+            log.warning(f"{self.path}:{self.entry_lineno}: skip entry without msgstr")
+        elif "fuzzy" not in self.entry_flags:
+            key = "".join(fields["msgid"])
+            if "msgctxt" in fields:
+                key = f"{''.join(fields['msgctxt'])}\x04{key}"
+
+            # the header (empty msgid) is metadata, "" must stay untranslated
+            if key and (
+                translated := "".join(fields.get("msgstr") or fields["msgstr[0]"])
+            ):
+                self.translations[key] = translated
+                if "python-format" in self.entry_flags:
+                    self.format_ids.add(key)
+
+        self._reset()
+
+    def close(self) -> dict[str, str]:
+        if self.step is not _po_parse_step.NULL:
+            self._flush()
+
+        # a broken template is dropped here instead of failing in `format` at runtime
+        for untranslated in self.format_ids:
+            if error := _check_format(untranslated, self.translations[untranslated]):
+                log.error(f"{self.path}: skip {untranslated!r}, {error}")
+                del self.translations[untranslated]
+
+        return self.translations
+
+
+def _get_format_fields(template: str) -> set[str]:
+    return {
+        _FORMAT_FIELD_RE.match(field).group()
+        for _, field, _, _ in Formatter().parse(template)
+        if field is not None
+    }
+
+
+def _check_format(untranslated: str, translated: str) -> str | None:
+    """
+    Check that the translated `python-format` template can be formatted with
+    the arguments of the untranslated one, return the error message if not.
+    """
+    try:
+        if fields := _get_format_fields(translated) - _get_format_fields(untranslated):
+            return f"unknown format fields {', '.join(sorted(fields))}"
+    except ValueError as error:
+        return f"invalid format template: {error}"
+    return None
+
+
+def _unescape(string: str) -> str:
+    if "\\" not in string:
+        return string
+    return _PO_ESCAPE_RE.sub(lambda match: _PO_ESCAPES[match.group(1)], string)
 
 
 def from_ctx_get_local(
@@ -216,18 +923,49 @@ def from_user_get_local(user: User | Member, **kwargs) -> str:
     return user.guild.preferred_locale or get_default_locale()
 
 
+def get_command_translator(command: Command | ApplicationCommand) -> Translator:
+    """
+    Get the translator of the command, bound to its cog by `cog_i18n`
+    or to the module the command callback is defined in.
+    """
+    if (translator := getattr(command.cog, "__translator__", None)) is not None:
+        return translator
+    return Translator(command.callback.__module__)
+
+
+class I18nBinding:
+    """
+    The i18n state of one command invocation, see `I18nContext`.
+
+    The locales are resolved from the context the first time they are used.
+    """
+
+    __slots__ = ("translator", "_local", "_guild_local")
+
+    def __init__(self, translator: Translator) -> None:
+        self.translator = translator
+        self._local: str | None = None
+        self._guild_local: str | None = None
+
+    def local(
+        self,
+        ctx: DiscordContext | DiscordApplicationContext,
+        guild_local: bool = False,
+    ) -> str:
+        if guild_local:
+            if self._guild_local is None:
+                self._guild_local = from_ctx_get_local(ctx, guild_local=True)
+            return self._guild_local
+
+        if self._local is None:
+            self._local = from_ctx_get_local(ctx)
+        return self._local
+
+
 async def command_before_invoke(
     ctx: DiscordContext | DiscordApplicationContext,
 ) -> "Context" | "ApplicationContext":
-    def _base_translator(*args, **kwargs):
-        return Translator(
-            __name__,
-            locales_path=Path(traceback.extract_stack()[-2].filename).parent
-            / "locales",
-        )(*args, local=from_ctx_get_local(ctx, **kwargs), **kwargs)
-
-    ctx.__dict__["local"] = lambda **kwargs: from_ctx_get_local(ctx, **kwargs)
-    ctx.__dict__["_"] = _base_translator
+    ctx.i18n = I18nBinding(get_command_translator(ctx.command))
 
     return ctx
 
@@ -243,22 +981,14 @@ def cog_i18n(cls: type | Translator | None = None):
         if hasattr(cog_class, "__translator__"):
             return cog_class
 
-        tr = (
-            cls
-            if isinstance(cls, Translator)
-            else Translator(
-                __name__,
-                locales_path=Path(traceback.extract_stack()[-2].filename).parent
-                / "locales",
-            )
-        )
+        tr = cls if isinstance(cls, Translator) else Translator(cog_class.__module__)
 
         setattr(cog_class, "__translator__", tr)
-        setattr(cog_class, "__translator_name__", tr(cog_class.__cog_name__, all=True))
+        setattr(cog_class, "__translator_name__", tr(cog_class.__cog_name__))
         setattr(
             cog_class,
             "__translator_description__",
-            tr(cog_class.__cog_description__, all=True),
+            tr(cog_class.__cog_description__),
         )
 
         return cog_class
@@ -271,28 +1001,28 @@ def cog_i18n(cls: type | Translator | None = None):
 def i18n_command(command: _CommandT) -> _CommandT:
     kwargs = command.__original_kwargs__
 
-    if command.name_localizations is None:
+    if not command.name_localizations:  # `None` or `MISSING`
         command.name_localizations = {}
 
     if isinstance(name := kwargs.get("i18n_name", None), TranslatorString):
-        command.name_localizations |= dict(name)
+        command.name_localizations |= name.localizations()
 
     if isinstance(command, SlashCommand):
-        if command.description_localizations is None:
+        if not command.description_localizations:
             command.description_localizations = {}
 
         if isinstance(description := kwargs.get("i18n_description"), TranslatorString):
-            command.description_localizations |= dict(description)
+            command.description_localizations |= description.localizations()
 
         for option in command.options:
             if isinstance(option.name, TranslatorString):
                 if option.name_localizations is None:
                     command.name_localizations = {}
-                command.name_localizations |= dict(option.name)
+                command.name_localizations |= option.name.localizations()
 
             if isinstance(option.description, TranslatorString):
                 if option.description_localizations is None:
                     command.description_localizations = {}
-                command.description_localizations |= dict(option.description)
+                command.description_localizations |= option.description.localizations()
 
     return command
@@ -1,13 +1,20 @@
 import copy
+import gzip
 import logging
 import os
 import re
+import shutil
 import sys
+import threading
+import time
+import traceback
 from datetime import datetime, timedelta
+from functools import lru_cache
 from logging import Formatter, Logger, LogRecord
 from logging.handlers import BaseRotatingHandler
 from pathlib import Path
-from typing import Optional, Union
+from queue import Empty, Full, Queue
+from typing import Literal, Optional, Union
 
 import rich
 from pygments.styles.monokai import MonokaiStyle
@@ -16,13 +23,93 @@ from rich.syntax import PygmentsSyntaxTheme
 from rich.text import Text
 from rich.theme import Style, Theme
 
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
 log = logging.getLogger("bot")
 StrPath = Union[Path, str]
+OverflowPolicy = Literal["block", "drop", "drop_oldest"]
+Compression = Literal["gzip", "zstd"]
+_default_formatter = Formatter()
+
+
+@lru_cache(maxsize=1024)
+def strip_markup(msg: str) -> str:
+    """
+    The plain text of the rich markup `msg`, cached by the message template,
+    emoji codes are kept as they are.
+    """
+    try:
+        return Text.from_markup(msg, emoji=False).plain
+    except Exception as e:  # fix: aiohttp throw errors
+        log.debug(e)
+        return msg
+
+
+def format_message(formatter: Formatter, record: LogRecord, msg: str) -> str:
+    """
+    `formatter.format(record)` with `msg` as the message template,
+    the record is not copied and its `msg` is left as is.
+    """
+    if type(formatter).format is not Formatter.format:  # a custom `format`
+        record = copy.copy(record)
+        record.msg = msg
+        return formatter.format(record)
+
+    record.message = msg % record.args if record.args else msg
+    if formatter.usesTime():
+        record.asctime = formatter.formatTime(record, formatter.datefmt)
+    s = formatter.formatMessage(record)
+
+    if record.exc_info and not record.exc_text:
+        record.exc_text = formatter.formatException(record.exc_info)
+    if record.exc_text:
+        if s[-1:] != "\n":
+            s += "\n"
+        s += record.exc_text
+    if record.stack_info:
+        if s[-1:] != "\n":
+            s += "\n"
+        s += formatter.formatStack(record.stack_info)
+    return s
+
+
+def compress_file(path: Path, compression: Compression = "gzip") -> Path:
+    """
+    Compress `path` to `path.gz` (or `path.zst`) and delete it,
+    the compressed file is written to a temporary file and replaced when complete.
+    """
+    target = path.with_name(path.name + (".zst" if compression == "zstd" else ".gz"))
+    tmp_path = target.with_name(f".{target.name}.tmp")
+
+    with path.open("rb") as src, tmp_path.open("wb") as file:
+        if compression == "zstd":
+            with zstandard.ZstdCompressor().stream_writer(file) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+        else:
+            with gzip.GzipFile(path.name, "wb", fileobj=file) as dst:
+                shutil.copyfileobj(src, dst, 1 << 20)
+
+    os.replace(tmp_path, target)
+    path.unlink()
+    return target
 
 
 class LogTimeRotatingFileHandler(BaseRotatingHandler):
     """
     from logging mode Modify
+
+    With `background`, records are put on a bounded queue and written by a writer
+    thread in batches, the file is flushed every `flush_interval` seconds.
+    When the queue is full, `overflow` decides to `block` the logging thread,
+    `drop` the new record or `drop_oldest` queued record.
+
+    A rollover only renames the file to `{filename}.{date}.{part}.log`,
+    a maintenance thread compresses the segments with `compression`
+    and deletes the segments older than `expired_interval`,
+    at most `backupCount` segments are kept per day.
     """
 
     def __init__(
@@ -34,6 +121,12 @@ class LogTimeRotatingFileHandler(BaseRotatingHandler):
         maxBytes: int = 1e6,
         backupCount: int = 5,
         encoding: str = "utf-8",
+        background: bool = False,
+        queue_size: int = 10_000,
+        batch_size: int = 512,
+        flush_interval: float = 1.0,
+        overflow: OverflowPolicy = "drop",
+        compression: Optional[Compression] = "gzip",
     ) -> None:
         directory = Path(directory or Path("logs"))
         directory.mkdir(parents=True, exist_ok=True)
@@ -54,49 +147,296 @@ class LogTimeRotatingFileHandler(BaseRotatingHandler):
         self.expired_interval = expired_interval
         self.maxBytes = maxBytes
         self.backupCount = backupCount
+        # without backups the file can't be rotated by size
+        self._max_bytes = (
+            int(maxBytes) if maxBytes > 0 and backupCount > 0 else sys.maxsize
+        )
 
-        self.rolloverAt = self.computeRollover()
+        self.set_rollover()
+
+        if compression == "zstd" and zstandard is None:
+            log.debug("zstandard is not installed, compressing logs with gzip")
+            compression = "gzip"
+        self.compression = compression
+        self._segment_re = re.compile(
+            rf"{re.escape(filename)}\."
+            r"(?P<time>\d{4}-\d{2}-\d{2})\."
+            r"(?P<part>\d+)\.log(?P<suffix>\.gz|\.zst)?"
+        )
+        self._segment_time = self.get_segment_time()
+        # continue the part numbers of today, the oldest part is deleted first
+        self._part = max(
+            (
+                int(match["part"])
+                for match, _ in self.get_segments()
+                if match["time"] == self._segment_time
+            ),
+            default=0,
+        )
+
+        self._closing = False
+        self._maintain = threading.Event()
+        self._maintainer = threading.Thread(
+            target=self._run_maintainer,
+            name=f"log-maintainer-{filename}",
+            daemon=True,
+        )
+        self._maintainer.start()
+        # compress the segments left by the last run
+        self._maintain.set()
+
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.overflow = overflow
+        self.dropped = 0  # dropped records, not reported yet
+        self._dropped_lock = threading.Lock()
+        self._queue: Optional[Queue[Optional[LogRecord]]] = None
+        self._writer: Optional[threading.Thread] = None
+
+        if background:
+            self._queue = Queue(queue_size)
+            # daemon: `logging.shutdown` (atexit) closes the handler, see `close`
+            self._writer = threading.Thread(
+                target=self._run_writer,
+                name=f"log-writer-{filename}",
+                daemon=True,
+            )
+            self._writer.start()
+
+    def emit(self, record: LogRecord) -> None:
+        if self._queue is None:
+            self._write(record)
+            return self.flush()
+
+        try:
+            self._enqueue(self.prepare(record))
+        except Exception:
+            self.handleError(record)
+
+    def prepare(self, record: LogRecord) -> LogRecord:
+        # the writer thread formats a snapshot, the record is still used by the
+        # other handlers and the arguments may be changed after the call
+        template = self.get_template(record)
+        record = copy.copy(record)
+        record.msg = str(template) % record.args if record.args else template
+        record.args, record.markup = None, False
+        return record
+
+    def _enqueue(self, record: LogRecord) -> None:
+        if self.overflow == "block":
+            return self._queue.put(record)
+
+        try:
+            self._queue.put_nowait(record)
+        except Full:
+            if self.overflow == "drop_oldest":
+                try:
+                    self._queue.get_nowait()
+                    self._queue.put_nowait(record)
+                except (Empty, Full):
+                    pass
+
+            with self._dropped_lock:
+                self.dropped += 1
+
+    def _run_writer(self) -> None:
+        queue = self._queue
+        flush_at: Optional[float] = None  # the time to flush the written records
+        closing = False
+
+        while not closing:
+            timeout = None if flush_at is None else max(flush_at - time.monotonic(), 0)
+            try:
+                batch = [queue.get(timeout=timeout)]
+            except Empty:
+                batch = []
+
+            while batch and len(batch) < self.batch_size:
+                try:
+                    batch.append(queue.get_nowait())
+                except Empty:
+                    break
+
+            for record in batch:
+                if record is None:  # see `close`, write the records left and stop
+                    closing = True
+                else:
+                    self._write(record)
+
+            if batch and flush_at is None:
+                flush_at = time.monotonic() + self.flush_interval
+
+            # the thread must survive a full disk, nothing would restart it
+            try:
+                if self.dropped:
+                    with self._dropped_lock:
+                        dropped, self.dropped = self.dropped, 0
+                    self._write_dropped(dropped)
+
+                if closing or (flush_at is not None and time.monotonic() >= flush_at):
+                    flush_at = None
+                    self._flush()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc(file=sys.stderr)
+
+    def _write(self, record: LogRecord) -> None:
+        try:
+            if self.shouldRollover(record):
+                self.doRollover()
+            if self.stream is None:
+                self.stream = self._open()
+
+            msg = self.format(record) + self.terminator
+            self.stream.write(msg)
+            self._bytes += (
+                len(msg) if msg.isascii() else len(msg.encode(self.encoding or "utf-8"))
+            )
+        except Exception:
+            self.handleError(record)
+
+    def _write_dropped(self, dropped: int) -> None:
+        record = log.makeRecord(
+            log.name,
+            logging.WARNING,
+            __file__,
+            0,
+            f"Log queue is full, dropped {dropped} records",
+            None,
+            None,
+        )
+        if self.filter(record):
+            self._write(record)
+
+    def _flush(self) -> None:
+        if self.stream and hasattr(self.stream, "flush"):
+            self.stream.flush()
+
+    def flush(self) -> None:
+        # the writer thread owns the stream and flushes it
+        if self._queue is None:
+            super().flush()
+
+    def close(self) -> None:
+        if self._queue is not None:
+            # a blocking `put` would never return if the writer thread is gone
+            while self._writer.is_alive():
+                try:
+                    self._queue.put(None, timeout=0.1)
+                    break
+                except Full:
+                    pass
+            self._writer.join()
+
+            # the records left by a dead writer thread
+            while True:
+                try:
+                    record = self._queue.get_nowait()
+                except Empty:
+                    break
+                if record is not None:
+                    self._write(record)
+            self._queue = None
+
+        if not self._closing:
+            # the thread must not log, `logging.shutdown` holds the handler lock
+            self._closing = True
+            self._maintain.set()
+            self._maintainer.join()
+
+        super().close()
+
+    def _run_maintainer(self) -> None:
+        closing = False
+        while not closing:
+            self._maintain.wait()
+            self._maintain.clear()
+            closing = self._closing
+            try:
+                self.compress_logs()
+                self.delete_expired_logs()
+            except Exception:
+                if logging.raiseExceptions:
+                    traceback.print_exc(file=sys.stderr)
+
+    def _open(self):
+        stream = super()._open()
+        # the size of the file, counted by `_write`, see `shouldRollover`
+        self._bytes = os.fstat(stream.fileno()).st_size
+        return stream
 
     def computeRollover(self) -> datetime:
-        return datetime.today() - self.interval_time
+        # the start of the next interval
+        today = datetime.today().replace(hour=0, minute=0, second=0, microsecond=0)
+        return today + self.interval_time
+
+    def set_rollover(self) -> None:
+        self.rolloverAt = self.computeRollover()
+        # a monotonic deadline, no datetime is built per record
+        self._rollover_deadline = time.monotonic_ns() + 1000 * (
+            (self.rolloverAt - datetime.now()) // timedelta(microseconds=1)
+        )
+
+    def get_template(self, record: LogRecord) -> object:
+        """
+        The message template of the record without markup, see `prepare`.
+        """
+        # only the message template is markup, not the arguments
+        if (
+            self.markup
+            and isinstance(msg := record.msg, str)
+            and "[" in msg
+            and getattr(record, "markup", True)
+        ):
+            return strip_markup(msg)
+        return record.msg
 
     def format(self, record: LogRecord):
-        if self.markup:
-            try:
-                record = copy.deepcopy(record)
-                record.msg = Text.from_markup(record.msg)
-            except Exception as e:  # fix: aiohttp throw errors
-                log.debug(e)
+        formatter = self.formatter or _default_formatter
 
-        return (self.formatter or Formatter()).format(record)
+        if (template := self.get_template(record)) is not record.msg:
+            return format_message(formatter, record, template)
+        return formatter.format(record)
 
     def shouldRollover(self, record: LogRecord) -> bool:
-        if self.stream is None:
-            self.stream = self._open()
-        if self.rolloverAt >= datetime.today():
-            return True
+        # the file is rotated after the record that reached `maxBytes`
+        return (
+            self._bytes >= self._max_bytes
+            or time.monotonic_ns() >= self._rollover_deadline
+        )
+
+    def get_segments(self) -> list[tuple[re.Match[str], Path]]:
+        return [
+            (match, file)
+            for file in self.directory.iterdir()
+            if (match := self._segment_re.fullmatch(file.name))
+        ]
 
-        if self.maxBytes > 0:
-            self.stream.seek(0, 2)
-            if self.stream.tell() + len(f"{record.msg}\n") >= self.maxBytes:
-                return True
+    def compress_logs(self) -> None:
+        if self.compression is None:
+            return
 
-        return False
+        for match, file in self.get_segments():
+            if match["suffix"] is None:
+                compress_file(file, self.compression)
 
     def delete_expired_logs(self) -> None:
-        file_time_re = re.compile(
-            rf"{self.filename}\-"
-            r"(?P<time>\d{4}\-\d{2}\-\d{2})"
-            r"(\.(?P<part>\d))?\.log"
-        )
-        end_time = datetime.today() - self.expired_interval
+        end_time = (datetime.today() - self.expired_interval).strftime("%Y-%m-%d")
+        segments: dict[str, list[tuple[int, Path]]] = {}
 
-        for file in self.directory.iterdir():
-            if (match := file_time_re.match(file.name)) and datetime.strptime(
-                match.groupdict()["time"], "%Y-%m-%d"
-            ) < end_time:
-                log.info(f"Deleting old log file: {file.name}")
+        for match, file in self.get_segments():
+            # the dates are zero-padded, they compare as strings
+            if match["time"] < end_time:
                 file.unlink(missing_ok=True)
+            else:
+                segments.setdefault(match["time"], []).append(
+                    (int(match["part"]), file)
+                )
+
+        if self.backupCount > 0:
+            for files in segments.values():
+                for _, file in sorted(files)[: -self.backupCount]:
+                    file.unlink(missing_ok=True)
 
     def get_file_name(
         self,
@@ -119,49 +459,81 @@ class LogTimeRotatingFileHandler(BaseRotatingHandler):
 
         return self.directory / f"{'.'.join(filenames)}.log"
 
-    def doRollover(self) -> bool:
+    def get_segment_time(self) -> str:
+        return (self.rolloverAt - self.interval_time).strftime("%Y-%m-%d")
+
+    def doRollover(self) -> None:
         if self.stream:
             self.stream.close()
             self.stream = None
 
-        if self.rolloverAt >= datetime.today():
-            for i in range(self.backupCount, 0, -1):
-                if (old_file := self.get_file_name(i, time=False)).exists():
-                    old_file.rename(
-                        self.get_file_name(
-                            i, time_str=self.rolloverAt.strftime("%Y-%m-%d")
-                        )
-                    )
-            self.rolloverAt = self.computeRollover()
-            return self.delete_expired_logs()
-
-        if self.backupCount > 0:
-            self.get_file_name(self.backupCount, time=False).unlink(missing_ok=True)
-            for i in range(self.backupCount - 1, 0, -1):
-                if (old_file := self.get_file_name(i, time=False)).exists():
-                    old_file.rename(self.get_file_name(i + 1, time=False))
-            (base_file := self.get_file_name(time=False)).rename(
-                base_file.with_suffix(".1.log")
+        # only a rename, the segment is compressed by the maintenance thread
+        if (base_file := self.get_file_name(time=False)).exists():
+            self._part += 1
+            base_file.rename(
+                self.get_file_name(self._part, time_str=self._segment_time)
             )
+            self._maintain.set()
+
+        if time.monotonic_ns() >= self._rollover_deadline:
+            self.set_rollover()
+            self._segment_time = self.get_segment_time()
+            self._part = 0
 
         self.stream = self._open()
 
 
 class PackagePathFilter(logging.Filter):
+    """
+    Set `record.relative`, the path of the record file relative to the first
+    `sys.path` entry containing it. The prefix index is shared by the filters
+    and rebuilt when `sys.path` changes, a record is only resolved once.
+    """
+
+    _sys_path: list[str] = []
+    _prefixes: dict[str, int] = {}  # {absolute sys.path entry: index}
+
     def filter(self, record):
-        pathname = record.pathname
-        sys_path = list(sys.path)
-        for i in range(len(sys_path)):
-            sys_path[i] = os.path.abspath(sys_path[i])
-        for path in sys_path:
-            if pathname.startswith(path):
-                relative = os.path.relpath(pathname, path)
+        # already set by the filter of another handler
+        if "relative" not in record.__dict__:
+            if sys.path != PackagePathFilter._sys_path:
+                self.build_prefixes()
+            if (relative := self.get_relative(record.pathname)) is not None:
                 record.relative = relative
-                break
         return True
 
+    @classmethod
+    def build_prefixes(cls) -> None:
+        sys_path = list(sys.path)
+        prefixes = {}
+        for index, path in enumerate(sys_path):
+            prefixes.setdefault(os.path.abspath(path), index)
+
+        cls._sys_path, cls._prefixes = sys_path, prefixes
+        cls.get_relative.cache_clear()
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def get_relative(pathname: str) -> Optional[str]:
+        prefixes = PackagePathFilter._prefixes
+        found: Optional[tuple[int, str]] = None  # (index, path)
+
+        directory = os.path.dirname(pathname)
+        while True:
+            if (index := prefixes.get(directory)) is not None and (
+                found is None or index < found[0]
+            ):
+                found = (index, directory)
+            if (parent := os.path.dirname(directory)) == directory:
+                break
+            directory = parent
+
+        return None if found is None else os.path.relpath(pathname, found[1])
+
 
-def init_logging(level: int, directory: Optional[StrPath] = None) -> Logger:
+def init_logging(
+    level: int, directory: Optional[StrPath] = None, background: bool = False
+) -> Logger:
     dpy_logger = logging.getLogger("discord")
     warnings_logger = logging.getLogger("py.warnings")
 
@@ -203,8 +575,10 @@ def init_logging(level: int, directory: Optional[StrPath] = None) -> Logger:
     shell_handler.addFilter(PackagePathFilter())
     shell_handler.setFormatter(shell_formatter)
 
+    # a writer thread only helps with spare cores, the records are still
+    # copied on the logging thread, see `LogTimeRotatingFileHandler.prepare`
     file_handler = LogTimeRotatingFileHandler(
-        log.name, markup=True, directory=directory
+        log.name, markup=True, directory=directory, background=background
     )
     file_handler.setLevel(logging.DEBUG)
     file_handler.addFilter(PackagePathFilter())
@@ -15,7 +15,7 @@ __all__ = (
     "I18nCog",
 )
 
-from ..core.i18n import Translator, TranslatorString
+from ..core.i18n import I18nBinding, Translator, TranslatorString
 
 if TYPE_CHECKING:
     from ..core.bot import Bot
@@ -79,6 +79,13 @@ class BaseCog(discord.Cog, metaclass=BaseCogMeta):
 
 
 class I18nContext:
+    """
+    The i18n methods of the command context,
+    `i18n` is bound by `command_before_invoke`.
+    """
+
+    i18n: I18nBinding
+
     @overload
     def _(
         self,
@@ -100,13 +107,16 @@ class I18nContext:
     ) -> dict[str, str]:
         ...
 
-    # typeof: import bot.core.i18n from command_before_invoke
-    def local(guild_local: bool = None) -> str:
-        raise NotImplementedError
+    def _(self, untranslated, *, local=None, guild_local=False, all=None):
+        i18n = self.i18n
+        return i18n.translator(
+            untranslated,
+            local=local or i18n.local(self, guild_local),
+            all=all,
+        )
 
-    # typeof: import bot.core.i18n from command_before_invoke
-    def _() -> ...:
-        raise NotImplementedError
+    def local(self, guild_local: bool = False) -> str:
+        return self.i18n.local(self, guild_local)
 
 
 class ApplicationContext(I18nContext, DiscordApplicationContext):
@@ -0,0 +1,512 @@
+from __future__ import annotations
+
+import importlib.util
+import json
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+import timeit
+import tracemalloc
+from pathlib import Path
+from types import ModuleType, SimpleNamespace
+from typing import Any, Callable, Coroutine, TypeVar
+
+import click
+
+T = TypeVar("T")
+
+SIZES = (100, 1_000, 10_000)
+LOCALES = ("en-US", "ja", "zh-CN")
+LOCALE_COUNTS = (1, 3, 10)
+# {"name", "size", "locales", "us"}, saved by `cli -o`
+RESULTS: list[dict[str, Any]] = []
+
+
+def summon_catalog(directory: Path, size: int, locales: tuple[str, ...] = LOCALES):
+    """
+    Write a synthetic catalog with `size` entries for every locale in `locales`.
+    """
+    directory.mkdir(parents=True, exist_ok=True)
+
+    for locale in locales:
+        lines = ['msgid ""', 'msgstr ""', f'"Language: {locale}\\n"', ""]
+        for i in range(size):
+            lines.extend(
+                [
+                    f"#: bench.py:{i}",
+                    "#, python-format",
+                    f'msgid "message {i} {{name}}"',
+                    'msgstr ""',
+                    f'"{locale} message {i}\\n"',
+                    '"{name} \\"quoted\\""',
+                    "",
+                ]
+            )
+        (directory / f"{locale}.po").write_text("\n".join(lines), encoding="utf-8")
+
+    return directory
+
+
+def measure(func: Callable[[], object], number: int) -> float:
+    """
+    Return the best per-call time of `func` in microseconds.
+    """
+    return min(timeit.repeat(func, number=number, repeat=5)) / number * 1e6
+
+
+def run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """
+    Run a coroutine that never suspends without an event loop.
+    """
+    try:
+        coro.send(None)
+    except StopIteration as result:
+        return result.value
+    raise RuntimeError("coroutine suspended")
+
+
+def get_locales(count: int) -> tuple[str, ...]:
+    """
+    `count` valid locales, `LOCALES` first.
+    """
+    from discord.commands.core import valid_locales
+
+    others = [locale for locale in valid_locales if locale not in LOCALES]
+    return (LOCALES + tuple(others))[:count]
+
+
+def echo_result(name: str, size: int, us: float, locales: int = len(LOCALES)) -> None:
+    RESULTS.append({"name": name, "size": size, "locales": locales, "us": us})
+    click.echo(f"{name:<32} {size:>8} {locales:>4} {us:>12.3f} us/call")
+
+
+def save_results(path: Path) -> None:
+    try:
+        commit = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        commit = None
+
+    path.write_text(
+        json.dumps(
+            {
+                "commit": commit,
+                "python": platform.python_version(),
+                "time": time.strftime("%Y-%m-%d %H:%M:%S%z"),
+                "results": RESULTS,
+            },
+            indent=2,
+        ),
+        encoding="utf-8",
+    )
+    click.echo(f"save {len(RESULTS)} results to {path}")
+
+
+@click.group()
+@click.option("-o", "output", help="save the results as json", type=Path)
+@click.pass_context
+def cli(ctx: click.Context, output: Path | None):
+    if output is not None:
+        ctx.call_on_close(lambda: save_results(output))
+
+
+@cli.command()
+@click.option("-n", "number", help="calls per repeat", default=1_000, type=int)
+def translator(number: int):
+    """`Translator(...)` construction and lookup on growing catalogs"""
+    from bot.core.i18n import Translator
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = summon_catalog(Path(tmp) / str(size), size)
+            tr = Translator(__name__, locales_path=path)
+
+            echo_result(
+                "Translator(...)",
+                size,
+                measure(lambda: Translator(__name__, locales_path=path), number),
+            )
+            echo_result(
+                "Translator.__call__",
+                size,
+                measure(lambda: tr("message 0 {name}", local="en-US"), number),
+            )
+            string = tr("message 0 {name}", local="en-US")
+            echo_result(
+                "TranslatorString.format",
+                size,
+                measure(lambda: string.format(name="bench"), number),
+            )
+
+
+@cli.command()
+@click.option("-n", "number", help="calls per repeat", default=10, type=int)
+def catalog(number: int):
+    """`.po` parsing against opening the compiled `.mo` catalogs"""
+    from bot.core.i18n import _get_langs_translation, _parse
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = summon_catalog(Path(tmp) / str(size), size)
+            po_file = path / f"{LOCALES[0]}.po"
+            catalogs = _get_langs_translation(path)  # compile `.mo` files
+
+            echo_result(
+                "_parse",
+                size,
+                measure(lambda: _parse(po_file.read_text(encoding="utf-8")), number),
+            )
+            echo_result(
+                "_get_langs_translation",
+                size,
+                measure(lambda: _get_langs_translation(path), number),
+            )
+            echo_result(
+                "MOCatalog.__getitem__",
+                size,
+                measure(lambda: catalogs[LOCALES[0]]["message 0 {name}"], 1_000),
+            )
+            echo_result(
+                "MOCatalog.lookup (uncached)",
+                size,
+                measure(lambda: catalogs[LOCALES[0]].lookup("message 0 {name}"), 1_000),
+            )
+
+
+@cli.command()
+def memory():
+    """memory of the parsed catalogs (`LOCALES` locales)"""
+    from bot.core.catalog import compact_catalogs
+    from bot.core.i18n import _parse
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            path = summon_catalog(Path(tmp) / str(size), size)
+            texts = {
+                locale: (path / f"{locale}.po").read_text(encoding="utf-8")
+                for locale in LOCALES
+            }
+
+            tracemalloc.start()
+            catalogs = {locale: _parse(text) for locale, text in texts.items()}
+            parsed = tracemalloc.get_traced_memory()[0]
+            catalogs = compact_catalogs(catalogs)
+            compact = tracemalloc.get_traced_memory()[0]
+            tracemalloc.stop()
+            del catalogs
+
+            click.echo(f"{'dict[str, str]':<32} {size:>8} {parsed / 1024:>12.1f} KiB")
+            click.echo(
+                f"{'compact_catalogs':<32} {size:>8} {compact / 1024:>12.1f} KiB"
+            )
+
+
+@cli.command()
+@click.option("-n", "number", help="calls per repeat", default=1, type=int)
+def parse(number: int):
+    """`_parse` on large catalogs, the time per entry should stay flat"""
+    from bot.core.i18n import _parse
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (10_000, 50_000, 100_000):
+            path = summon_catalog(Path(tmp) / str(size), size, LOCALES[:1])
+            po_file = path / f"{LOCALES[0]}.po"
+
+            def run():
+                with po_file.open(encoding="utf-8") as file:
+                    return _parse(file, po_file)
+
+            assert len(run()) == size  # the header entry is not stored
+            us = measure(run, number)
+            echo_result("_parse", size, us)
+            echo_result("_parse (per entry)", size, us / size)
+
+
+def summon_source(path: Path, size: int) -> Path:
+    """
+    Write a python file with `size` translated strings.
+    """
+    lines = ["from bot import Translator", "", "_ = Translator(__name__)", ""]
+    for i in range(size):
+        lines.extend([f"# comment {i}", f'_("message {i} {{name}}")'])
+    path.write_text("\n".join(lines), encoding="utf-8")
+
+    return path
+
+
+@cli.command()
+@click.option("-n", "number", help="calls per repeat", default=1, type=int)
+def extract(number: int):
+    """`ContentExtractor` and `POTFileManager`, the time per string should stay flat"""
+    from tool.i18n import ContentExtractor, POTFileManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in (1_000, 5_000, 10_000):
+            path = summon_source(Path(tmp) / f"source_{size}.py", size)
+            entries = ContentExtractor.from_file(path).entries
+
+            us = measure(lambda: ContentExtractor.from_file(path), number)
+            echo_result("ContentExtractor (per string)", size, us / size)
+            us = measure(lambda: POTFileManager().add_entries(path, entries), number)
+            echo_result("POTFileManager (per string)", size, us / size)
+
+
+def summon_module(directory: Path, size: int, name: str = "bench_cog") -> ModuleType:
+    """
+    Import a module with a command callback next to a synthetic catalog.
+    """
+    summon_catalog(directory / "locales", size)
+    (directory / f"{name}.py").write_text(
+        "async def command(ctx):\n"
+        "    pass\n"
+        "\n"
+        "\n"
+        "def translate(ctx):\n"
+        '    return ctx._("message 0 {name}")\n',
+        encoding="utf-8",
+    )
+
+    spec = importlib.util.spec_from_file_location(name, directory / f"{name}.py")
+    sys.modules[name] = module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    return module
+
+
+def fake_context(module: ModuleType, locale: str = LOCALES[0]):
+    from bot.utils import I18nContext
+
+    class FakeContext(I18nContext):
+        command = SimpleNamespace(callback=module.command, cog=None)
+        guild = SimpleNamespace(preferred_locale=locale)
+
+    return FakeContext()
+
+
+@cli.command()
+@click.option("-n", "number", help="calls per repeat", default=10_000, type=int)
+def context(number: int):
+    """`ctx._()` inside a command"""
+    from bot.core.i18n import command_before_invoke
+
+    with tempfile.TemporaryDirectory() as tmp:
+        module = summon_module(Path(tmp), SIZES[0])
+        ctx = run_sync(command_before_invoke(fake_context(module)))
+        context_cls = type(ctx)
+
+        echo_result(
+            "command_before_invoke",
+            SIZES[0],
+            measure(lambda: run_sync(command_before_invoke(ctx)), number),
+        )
+        echo_result(
+            "ctx._",
+            SIZES[0],
+            measure(lambda: module.translate(ctx), number),
+        )
+
+        def command():  # a command with a few translated strings
+            ctx = run_sync(command_before_invoke(context_cls()))
+            for _ in range(3):
+                module.translate(ctx)
+
+        echo_result("command (invoke + 3 * ctx._)", SIZES[0], measure(command, number))
+
+
+def summon_command(tr: Any):
+    """
+    A slash command with a translated name and description, as declared in the cogs.
+    """
+    import discord
+
+    async def command(ctx):
+        pass
+
+    return discord.SlashCommand(
+        command,
+        i18n_name=tr("message 0 {name}"),
+        i18n_description=tr("message 1 {name}"),
+    )
+
+
+@cli.command()
+@click.option("-n", "number", help="calls per repeat", default=100, type=int)
+def suite(number: int):
+    """every i18n path on growing catalogs and locale counts, use `-o` to save"""
+    from bot.core.i18n import (
+        Translator,
+        _get_langs_translation,
+        _parse,
+        i18n_command,
+    )
+    from tool.i18n import ContentExtractor, POTFileManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in SIZES:
+            for count in LOCALE_COUNTS:
+                locales = get_locales(count)
+                path = summon_catalog(Path(tmp) / f"{size}_{count}", size, locales)
+                text = (path / f"{locales[0]}.po").read_text(encoding="utf-8")
+
+                if count == 1:  # one file, the locale count doesn't matter
+                    echo_result("_parse", size, measure(lambda: _parse(text), 1), count)
+
+                _get_langs_translation(path)  # compile `.mo` files
+                echo_result(
+                    "_get_langs_translation",
+                    size,
+                    measure(lambda: _get_langs_translation(path), number),
+                    count,
+                )
+
+                tr = Translator(__name__, locales_path=path)
+                echo_result(
+                    "Translator.__call__",
+                    size,
+                    measure(lambda: tr("message 0 {name}"), number * 100),
+                    count,
+                )
+                echo_result(
+                    "Translator.__call__ (all)",
+                    size,
+                    measure(lambda: tr("message 0 {name}", all=True), number),
+                    count,
+                )
+
+                string = tr("message 0 {name}", local=locales[-1])
+                echo_result(
+                    "TranslatorString.format",
+                    size,
+                    measure(lambda: string.format(name="bench"), number * 100),
+                    count,
+                )
+
+                command = summon_command(tr)
+
+                def localize():
+                    tr._localizations = {}  # drop the cached maps, not the tables
+                    i18n_command(command)
+
+                echo_result("i18n_command", size, measure(localize, number), count)
+
+        for size in SIZES:
+            path = summon_source(Path(tmp) / f"source_{size}.py", size)
+            entries = ContentExtractor.from_file(path).entries
+
+            echo_result(
+                "ContentExtractor",
+                size,
+                measure(lambda: ContentExtractor.from_file(path), 1),
+                0,
+            )
+            echo_result(
+                "POTFileManager",
+                size,
+                measure(lambda: POTFileManager().add_entries(path, entries), 1),
+                0,
+            )
+
+
+@cli.command()
+@click.argument("old", type=Path)
+@click.argument("new", type=Path)
+@click.option("-t", "threshold", help="allowed slowdown ratio", default=1.2)
+def compare(old: Path, new: Path, threshold: float):
+    """compare two saved results, exit with 1 when a path got slower"""
+    old_data, new_data = (json.loads(p.read_text(encoding="utf-8")) for p in (old, new))
+    old_results = {
+        (r["name"], r["size"], r["locales"]): r["us"] for r in old_data["results"]
+    }
+
+    regressions = 0
+    click.echo(f"{old_data['commit']} -> {new_data['commit']}")
+    for result in new_data["results"]:
+        key = (result["name"], result["size"], result["locales"])
+        if (old_us := old_results.get(key)) is None:
+            continue
+
+        ratio = result["us"] / old_us
+        regressions += (slower := ratio > threshold)
+        click.echo(
+            f"{key[0]:<32} {key[1]:>8} {key[2]:>4} "
+            f"{old_us:>12.3f} {result['us']:>12.3f} {ratio:>6.2f}x"
+            + (" slower" if slower else "")
+        )
+
+    if regressions:
+        raise SystemExit(1)
+
+
+@cli.command()
+@click.option("-n", "number", help="records per run", default=20_000, type=int)
+@click.option("-r", "rollovers", help="daily rollovers", default=50, type=int)
+def log(number: int, rollovers: int):
+    """`LogTimeRotatingFileHandler` throughput, the time per record and rollover"""
+    import logging
+
+    from bot.core.logging import LogTimeRotatingFileHandler
+
+    modes = (
+        ("sync", {}),
+        ("sync+markup", {"markup": True}),
+        ("queue", {"background": True, "overflow": "block"}),
+        ("queue+markup", {"background": True, "overflow": "block", "markup": True}),
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, kwargs in modes:
+            try:
+                handler = LogTimeRotatingFileHandler("bench", tmp, **kwargs)
+            except TypeError:  # no background mode
+                continue
+            handler.setFormatter(
+                logging.Formatter(
+                    "[{asctime}] [{levelname}:{name}]: {message}", style="{"
+                )
+            )
+            logger = logging.getLogger(f"benchmark.{mode}")
+            logger.propagate = False
+            logger.addHandler(handler)
+
+            start = time.perf_counter()
+            for i in range(number):
+                logger.warning("[green]record[/green] %d of the log benchmark", i)
+            emitted = time.perf_counter()
+            handler.close()
+            closed = time.perf_counter()
+            logger.removeHandler(handler)
+
+            for name, seconds in (
+                (f"emit ({mode})", emitted - start),
+                (f"emit + close ({mode})", closed - start),
+            ):
+                echo_result(name, number, seconds / number * 1e6, 0)
+                click.echo(f"{'':<32} {number / seconds:>25,.0f} records/s")
+
+        # the pause of a daily rollover, in a directory of 2000 other files
+        directory = Path(tmp, "rollover")
+        directory.mkdir()
+        for i in range(2000):
+            (directory / f"other.{i}.log").touch()
+
+        handler = LogTimeRotatingFileHandler("bench", directory)
+        seconds = 0.0
+        for _ in range(rollovers):
+            handler.stream.write("record\n")
+            handler._rollover_deadline = 0
+            start = time.perf_counter()
+            handler.doRollover()
+            seconds += time.perf_counter() - start
+            if handler.stream is None:
+                handler.stream = handler._open()
+        handler.close()
+        echo_result("daily rollover", rollovers, seconds / rollovers * 1e6, 0)
+
+
+if __name__ == "__main__":
+    cli()
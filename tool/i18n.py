@@ -1,14 +1,15 @@
 from __future__ import annotations
 
 import ast
+import hashlib
 import inspect
-import io
+import json
 import re
 import sys
 import time
-import tokenize
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
-from typing import Any
+from typing import Any, Iterable, Iterator, NamedTuple
 
 import click
 from polib import POEntry, POFile, pofile
@@ -29,10 +30,22 @@ USE_FORMAT_STR = re.compile(
     r"\[[^\]'\"]+\])*(![rsa])?(:\w?[><=^]?[ +-]?#?\d*,?(\.\d+)?[bcdeEfFgGnosxX%]?)?}|"
     r"%(\([\w\s]*\))?[-+#0]*(\d+|\*)?(\.(\d+|\*))?([hlL])?[diouxXeEfFgGcrsab%]"
 )
+POT_CREATION_DATE_RE = re.compile(r'^"POT-Creation-Date: .*"\n', re.MULTILINE)
 
 __version__ = "1.0.0"
 
 
+class EntryRecord(NamedTuple):
+    """
+    A string extracted by `ContentExtractor`, see `POTFileManager.add_entry`.
+    """
+
+    id: str
+    comments: list[str] | None
+    lineno: int
+    is_docstring: bool = False
+
+
 class POTFileManager:
     def __init__(self, **kwargs: Any) -> None:
         """
@@ -47,6 +60,9 @@ class POTFileManager:
         self.relative_cwd = kwargs.pop("relative_cwd", False)
 
         self._potfiles: dict[Path, POFile] = {}
+        # {output dir: {msgid: entry}}, `POFile.find` is a linear scan
+        self._indexes: dict[Path, dict[str, POEntry]] = {}
+        self.index: dict[str, POEntry] = {}
 
     def move_to_current_file(self, path: Path | str) -> None:
         self.current_file = Path(path)
@@ -55,9 +71,16 @@ class POTFileManager:
 
         self._out_dir = current_dir / self.out_dir
         if self._out_dir not in self._potfiles:
-            self.potfile: POFile = POFile()
-            self._potfiles[self._out_dir] = self.potfile
-            self.potfile.metadata = self.potfile_metadata()
+            self._potfiles[self._out_dir] = POFile()
+            self._potfiles[self._out_dir].metadata = self.potfile_metadata()
+            self._indexes[self._out_dir] = {}
+
+        self.potfile: POFile = self._potfiles[self._out_dir]
+        self.index = self._indexes[self._out_dir]
+
+    @property
+    def output_dirs(self) -> list[Path]:
+        return list(self._potfiles)
 
     @staticmethod
     def potfile_metadata() -> dict[str, str]:
@@ -76,6 +99,17 @@ class POTFileManager:
             "Generated-By": f"dpy-template {__version__}",
         }
 
+    def add_entries(self, path: Path | str, entries: Iterable[EntryRecord]) -> None:
+        self.move_to_current_file(path)
+
+        for entry in entries:
+            self.add_entry(
+                entry.id,
+                entry.comments,
+                lineno=entry.lineno,
+                is_docstring=entry.is_docstring,
+            )
+
     @classmethod
     def from_file(cls, path: str, **kwargs) -> POTFileManager:
         return cls(
@@ -83,35 +117,27 @@ class POTFileManager:
             **kwargs,
         )
 
-    def write(self, langs: list[str] = "zh-TW", overwrite: bool = False) -> None:
-        for outfile_path, potfile in self._potfiles.items():
-            for lang in langs:
-                current_file = outfile_path / f"{lang}.po"
-
-                potfile.metadata |= {"Language": lang}
-
-                old_potfile = potfile
-                if not overwrite and current_file.is_file():
-                    old_potfile = pofile(current_file)
-                    old_potfile.merge(potfile)
-
-                if not old_potfile[:]:
-                    continue
-                current_file.parent.mkdir(parents=True, exist_ok=True)
-
-                def sort(e: POEntry):
-                    try:
-                        path, line = e.occurrences[0]
-                    except IndexError:
-                        return ()
-
-                    # int is needed, sometimes he returns str type and throws an error
-                    return (path, int(line))
-
-                old_potfile.sort(key=sort)
-                old_potfile.save(str(current_file))
-
+    def write(
+        self,
+        langs: list[str] = "zh-TW",
+        overwrite: bool = False,
+        jobs: int | None = None,
+    ) -> None:
+        for potfile in self._potfiles.values():
+            # the occurrences are collected in a set, see `add_entry`
+            for entry in potfile:
+                entry.occurrences = sorted(entry.occurrences)
+
+        tasks = [
+            (potfile, outfile_path / f"{lang}.po", lang, overwrite)
+            for outfile_path, potfile in self._potfiles.items()
+            for lang in langs
+        ]
+        for current_file, written in write_po_files(tasks, jobs):
+            if written:
                 print(f"summon {current_file} done")
+            elif written is not None:
+                print(f"skip {current_file}, nothing changed")
 
     def add_entry(
         self,
@@ -127,7 +153,7 @@ class POTFileManager:
         if not id:
             return
 
-        entry = self.potfile.find(id)
+        entry = self.index.get(id)
         flags = ["docstring"] if is_docstring else []
         occurrence = (str(self.current_file), lineno)
 
@@ -139,14 +165,13 @@ class POTFileManager:
             flags.append("python-format")
 
         if entry is None:
-            self.potfile.append(
-                POEntry(
-                    msgid=id,
-                    comment=comment,
-                    occurrences=[occurrence],
-                    flags=flags,
-                )
+            self.index[id] = entry = POEntry(
+                msgid=id,
+                comment=comment,
+                occurrences={occurrence},
+                flags=flags,
             )
+            self.potfile.append(entry)
         else:
             if not entry.comment:
                 entry.comment = comment
@@ -155,32 +180,54 @@ class POTFileManager:
             if not entry.flags:
                 entry.flags = flags
 
-            if occurrence not in entry.occurrences:
-                entry.occurrences.append(occurrence)
-            entry.occurrences.sort()
+            entry.occurrences.add(occurrence)
 
 
 class ContentExtractor(ast.NodeVisitor):
     COMMENT_RE = re.compile(r"[\t ]*(#(?P<comment>.*))?")
+    NEWLINE_RE = re.compile(r"\r\n?|\n")
 
     def __init__(self, source: str, **kwargs: Any) -> None:
-        self.pot_file: POTFileManager = kwargs.pop("pot_file", POTFileManager(**kwargs))
+        self.current_file: Path | str | None = kwargs.pop("current_file", None)
+        self.entries: list[EntryRecord] = []
         self.source = source
+        self.lines = self.NEWLINE_RE.split(source)
+        # {line_number: [(start, end)]}, the byte ranges of strings with a "#"
+        self.string_ranges: dict[int, list[tuple[int, int]]] = {}
+        # [(entry index, line_number)], the comments are read after the visit
+        self.pending_comments: list[tuple[int, int]] = []
         self.file_comments: dict[int, str] = {}  # {line_number: comment}
-        self.get_comments()
 
     @classmethod
     def from_file(cls, path: Path | str, **kwargs: Any) -> ContentExtractor:
         source = Path(path).read_text(encoding="utf-8")
         self = cls(source, current_file=path, **kwargs)
 
-        self.visit(ast.parse(source))
+        self.extract(ast.parse(source))
 
         return self
 
+    def extract(self, tree: ast.AST) -> list[EntryRecord]:
+        """
+        Visit `tree` once, then attach the comments above every string.
+
+        The comments are read from the source lines instead of tokenizing
+        the whole file, a `#` is only a comment when no string covers it,
+        so the strings are collected by the visit first.
+        """
+        self.visit(tree)
+
+        for index, lineno in self.pending_comments:
+            self.entries[index] = self.entries[index]._replace(
+                comments=self.get_comment(lineno)
+            )
+        self.pending_comments.clear()
+
+        return self.entries
+
     def error(self, starting_node: ast.AST, msg: str) -> None:
         print(
-            f"{self.pot_file.current_file}:{starting_node.lineno}: {msg}\n"
+            f"{self.current_file}:{starting_node.lineno}: {msg}\n"
             + inspect.cleandoc(
                 ast.get_source_segment(
                     self.source,
@@ -198,34 +245,47 @@ class ContentExtractor(ast.NodeVisitor):
             else None
         )
 
+    def get_decorator_name(self, node: ast.expr) -> str | None:
+        if isinstance(node, ast.Call):  # @class_def()
+            node = node.func
+        if isinstance(node, ast.Attribute):  # @module.class_def
+            return node.attr
+        if isinstance(node, ast.Name):  # @class_def
+            return node.id
+        return None
+
     def get_node_class_locals(self, node: ast.ClassDef) -> list[ast.Constant]:
-        for deco in node.decorator_list:
-            if isinstance(deco, ast.Call):  # @class_def()
-                if deco.func.id in DECORATOR_NAMES:
-                    break
-            elif isinstance(deco, ast.Name):  # @class_def
-                if deco.id in DECORATOR_NAMES:
-                    break
-        else:
-            self.generic_visit(node)
+        if not any(
+            self.get_decorator_name(deco) in DECORATOR_NAMES
+            for deco in node.decorator_list
+        ):
             return []
 
-        result = []
-        for k in node.keywords:
-            if k.arg in DECORATOR_NAMES_CLASS_KWARGS:
-                result.append(k.value)
+        result = [
+            k.value for k in node.keywords if k.arg in DECORATOR_NAMES_CLASS_KWARGS
+        ]
 
         if isinstance(body := node.body[0], ast.Expr):
-            result.append(self.get_literal_string(body.value))
+            result.append(body.value)
 
-        return [d for d in result if d]
+        return [d for d in map(self.get_literal_string, result) if d]
 
     def visit_ClassDef(self, node: ast.ClassDef) -> None:
-        # self.add_entry(node, comments=comments, starting_node=node)
         for docs in self.get_node_class_locals(node):
             self.add_entry(docs)
         self.generic_visit(node)
 
+    def visit_Constant(self, node: ast.Constant) -> None:
+        if isinstance(value := node.value, str):
+            if "#" in value:
+                self.add_string_range(node)
+        elif isinstance(value, bytes) and b"#" in value:
+            self.add_string_range(node)
+
+    def visit_JoinedStr(self, node: ast.JoinedStr) -> None:
+        self.add_string_range(node)
+        self.generic_visit(node)
+
     def visit_Call(self, node: ast.Call) -> None:
         if isinstance(node.func, ast.Name):
             if node.func.id not in KEYWORDS:
@@ -245,16 +305,13 @@ class ContentExtractor(ast.NodeVisitor):
         arg = node.args[0]
 
         if string_node := self.get_literal_string(arg):
-            comments, tmp_line = [], -1
-            for node in (node, string_node):
-                if tmp_line == (lineno := node.lineno):
-                    comments.extend(self.get_comment(lineno))
-                tmp_line = lineno
-            self.add_entry(string_node, comments=comments, starting_node=node)
+            if node.lineno == string_node.lineno:
+                self.pending_comments.append((len(self.entries), node.lineno))
+            self.add_entry(string_node, comments=[])
+            self.visit_Constant(string_node)
         else:
             self.error(node, "輸入了錯誤的參數")
-
-        self.generic_visit(node)
+            self.generic_visit(node)
 
     def add_entry(
         self,
@@ -263,25 +320,51 @@ class ContentExtractor(ast.NodeVisitor):
         starting_node: ast.AST | None = None,
         is_docstring: bool = False,
     ) -> None:
-        self.pot_file.add_entry(
-            inspect.cleandoc(node.value),
-            comments=comments,
-            lineno=(starting_node or node).lineno,
-            is_docstring=is_docstring,
+        self.entries.append(
+            EntryRecord(
+                inspect.cleandoc(node.value),
+                comments=comments,
+                lineno=(starting_node or node).lineno,
+                is_docstring=is_docstring,
+            )
         )
 
-    def get_comments(self) -> None:
-        for type, data, loc, _, _ in tokenize.tokenize(
-            io.BytesIO(self.source.encode(encoding="utf-8")).readline
-        ):
-            if type is tokenize.COMMENT:
-                self.file_comments[loc[0]] = data.removeprefix("#").strip()
+    def add_string_range(self, node: ast.expr) -> None:
+        for lineno in range(node.lineno, node.end_lineno + 1):
+            self.string_ranges.setdefault(lineno, []).append(
+                (
+                    node.col_offset if lineno == node.lineno else 0,
+                    node.end_col_offset if lineno == node.end_lineno else sys.maxsize,
+                )
+            )
+
+    def get_line_comment(self, line_number: int) -> str:
+        if (comment := self.file_comments.get(line_number)) is not None:
+            return comment
 
-    def get_comment(self, line_number: int) -> list[str] | None:
+        comment = ""
+        if 0 < line_number <= len(self.lines) and "#" in (
+            line := self.lines[line_number - 1]
+        ):
+            if ranges := self.string_ranges.get(line_number):
+                # `col_offset` of the nodes is in utf-8 bytes
+                data, start = line.encode("utf-8"), -1
+                while (start := data.find(b"#", start + 1)) >= 0:
+                    if not any(begin <= start < end for begin, end in ranges):
+                        comment = data[start:].decode("utf-8")
+                        break
+            else:
+                start = line.index("#")
+                comment = line[start:]
+
+        self.file_comments[line_number] = comment = comment.removeprefix("#").strip()
+        return comment
+
+    def get_comment(self, line_number: int) -> list[str]:
         comments = []
 
         line_number -= 1
-        while comment := self.file_comments.get(line_number):
+        while comment := self.get_line_comment(line_number):
             comments.append(comment)
             line_number -= 1
 
@@ -289,6 +372,160 @@ class ContentExtractor(ast.NodeVisitor):
         return comments
 
 
+class ExtractCache:
+    """
+    The extracted entries of every file from the last runs,
+    a file is only extracted again when its content changed.
+    """
+
+    # bump it when the extraction result changes
+    VERSION = 2
+
+    def __init__(self, path: Path | None = None) -> None:
+        self.path = path
+        self.files: dict[str, dict[str, Any]] = {}
+
+        if path is not None and path.is_file():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+            except ValueError:
+                data = {}
+            if data.get("version") == self.VERSION:
+                self.files = data["files"]
+
+    @staticmethod
+    def _hash(path: Path) -> str:
+        return hashlib.sha1(path.read_bytes()).hexdigest()
+
+    def get(self, path: Path) -> list[EntryRecord] | None:
+        """
+        Get the cached entries of the file, `None` if it changed.
+        """
+        if (cached := self.files.get(str(path))) is None:
+            return None
+
+        stat = path.stat()
+        if (cached["mtime"], cached["size"]) != (stat.st_mtime_ns, stat.st_size):
+            if cached["hash"] != self._hash(path):
+                return None
+            cached["mtime"], cached["size"] = stat.st_mtime_ns, stat.st_size
+
+        return [EntryRecord(*entry) for entry in cached["entries"]]
+
+    def set(self, path: Path, entries: list[EntryRecord]) -> None:
+        stat = path.stat()
+        self.files[str(path)] = {
+            "mtime": stat.st_mtime_ns,
+            "size": stat.st_size,
+            "hash": self._hash(path),
+            "entries": entries,
+        }
+
+    def save(self, paths: list[Path]) -> None:
+        """
+        Save the cache of `paths`, deleted or excluded files are dropped.
+        """
+        keys = {str(path) for path in paths}
+        self.files = {key: file for key, file in self.files.items() if key in keys}
+
+        if self.path is not None:
+            self.path.write_text(
+                json.dumps({"version": self.VERSION, "files": self.files}),
+                encoding="utf-8",
+            )
+
+
+def extract_file(path: Path) -> list[EntryRecord]:
+    return ContentExtractor.from_file(path).entries
+
+
+def extract_files(
+    paths: list[Path], jobs: int | None = None
+) -> Iterator[list[EntryRecord]]:
+    """
+    Extract the files in a process pool, one file per task,
+    the results are yielded in the order of `paths`.
+    """
+    if jobs == 1 or len(paths) < 2:
+        yield from map(extract_file, paths)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(extract_file, paths)
+
+
+def write_po_file(
+    potfile: POFile, current_file: Path, lang: str, overwrite: bool = False
+) -> tuple[Path, bool | None]:
+    """
+    Merge `potfile` into `current_file` and save it.
+
+    Returns `current_file` and whether it was written, `False` when the merged
+    content is the same as the file (`POT-Creation-Date` aside), so unchanged
+    files keep their mtime, `None` when there is nothing to write.
+    """
+    potfile.metadata |= {"Language": lang}
+
+    old_content = None
+    old_potfile = potfile
+    if current_file.is_file():
+        old_content = current_file.read_text(encoding="utf-8")
+        if not overwrite:
+            old_potfile = pofile(str(current_file))
+            old_potfile.merge(potfile)
+
+    if not old_potfile[:]:
+        return current_file, None
+
+    def sort(e: POEntry):
+        try:
+            path, line = e.occurrences[0]
+        except IndexError:
+            return ()
+
+        # int is needed, sometimes he returns str type and throws an error
+        return (path, int(line))
+
+    old_potfile.sort(key=sort)
+
+    if old_content is not None and POT_CREATION_DATE_RE.sub(
+        "", str(old_potfile)
+    ) == POT_CREATION_DATE_RE.sub("", old_content):
+        return current_file, False
+
+    current_file.parent.mkdir(parents=True, exist_ok=True)
+    old_potfile.save(str(current_file))
+
+    return current_file, True
+
+
+def write_po_files(
+    tasks: list[tuple[POFile, Path, str, bool]], jobs: int | None = None
+) -> Iterator[tuple[Path, bool | None]]:
+    """
+    Run `write_po_file` for every (output dir, lang) pair in a process pool,
+    the results are yielded in the order of `tasks`.
+    """
+    if jobs == 1 or len(tasks) < 2:
+        yield from (write_po_file(*task) for task in tasks)
+        return
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(write_po_file, *zip(*tasks))
+
+
+def compile_catalogs(paths: Iterable[Path]) -> None:
+    """
+    Compile the `.po` files of the locales directories `paths` to the `.mo`
+    catalogs loaded by the bot, broken format templates are reported and
+    left out, see `bot.core.i18n.compile_locales`.
+    """
+    from bot.core.i18n import compile_locales
+
+    for path in compile_locales(*paths):
+        print(f"compile {path} done")
+
+
 def show_version(ctx: click.Context, _: click.Parameter, value: Any):
     if not value or ctx.resilient_parsing:
         return
@@ -324,7 +561,21 @@ def show_version(ctx: click.Context, _: click.Parameter, value: Any):
 @click.option("-r", "recursive", help="use recursive", is_flag=True)
 @click.option("-l", "lang", help="output lang", default="zh-TW", type=str)
 @click.option("-o", "overwrite", help="overwrite old po file", is_flag=True)
-def main_command(**kwargs):
+@click.option("-j", "jobs", help="extract and write processes", default=None, type=int)
+@click.option(
+    "-c",
+    "cache_path",
+    help="extract cache file",
+    default=".i18n_cache.json",
+    type=Path,
+)
+@click.option("--no-cache", "no_cache", help="disable the extract cache", is_flag=True)
+@click.option(
+    "--compile", "compile", help="compile the catalogs for the bot", is_flag=True
+)
+def main_command(no_cache: bool, **kwargs):
+    if no_cache:
+        kwargs["cache_path"] = None
     return main(**kwargs)
 
 
@@ -334,6 +585,9 @@ def main(
     recursive=True,
     lang: str = "zh-TW",
     overwrite: bool = False,
+    jobs: int | None = None,
+    cache_path: Path | None = Path(".i18n_cache.json"),
+    compile: bool = False,
 ) -> None:
     include_paths: list[Path] = []
 
@@ -347,12 +601,24 @@ def main(
         excluded_files = set(Path().glob(glob))
         include_paths = [f for f in include_paths if f not in excluded_files]
 
+    cache = ExtractCache(cache_path)
+    entries = {path: cache.get(path) for path in include_paths}
+
+    changed = [path for path, cached in entries.items() if cached is None]
+    for path, extracted in zip(changed, extract_files(changed, jobs)):
+        cache.set(path, extracted)
+        entries[path] = extracted
+    cache.save(include_paths)
+
     potfile_manager = POTFileManager()
+    # merged in the order of `include_paths`, the same output as a serial run
     for path in include_paths:
-        potfile_manager.move_to_current_file(path)
-        ContentExtractor.from_file(path, pot_file=potfile_manager)
+        potfile_manager.add_entries(path, entries[path])
+
+    potfile_manager.write(langs=lang.split(","), overwrite=overwrite, jobs=jobs)
 
-    potfile_manager.write(langs=lang.split(","), overwrite=overwrite)
+    if compile:
+        compile_catalogs(potfile_manager.output_dirs)
 
 
 if __name__ == "__main__":